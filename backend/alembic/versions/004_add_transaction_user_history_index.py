@@ -0,0 +1,35 @@
+"""add composite index for user transaction history
+
+Revision ID: 004
+Revises: 62ec15ab25a2
+Create Date: 2025-11-07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '004'
+down_revision = '62ec15ab25a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # User history queries filter by user_address (and optionally tx_type)
+    # and sort by created_at DESC; serve them from a single index range scan
+    op.create_index(
+        'ix_tx_user_type_created',
+        'transactions',
+        ['user_address', 'tx_type', sa.text('created_at DESC')],
+        unique=False,
+    )
+    
+    # Redundant: user_address is the leading column of the composite index
+    op.drop_index(op.f('ix_transactions_user_address'), table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transactions_user_address'), 'transactions', ['user_address'], unique=False)
+    op.drop_index('ix_tx_user_type_created', table_name='transactions')
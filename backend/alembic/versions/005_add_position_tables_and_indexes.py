@@ -0,0 +1,78 @@
+"""add position tables and per-user indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-11-07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _index_names(table: str) -> set:
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    # The position tables were never part of a migration; create them here
+    # so the indexes below have something to attach to
+    if not _has_table('supply_positions'):
+        op.create_table(
+            'supply_positions',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('asset_id', sa.String(length=64), nullable=False, comment='Liquid asset ID'),
+            sa.Column('atoken_amount', sa.BigInteger(), nullable=False, comment='aToken amount held (satoshis)'),
+            sa.Column('liquidity_index_at_supply', sa.BigInteger(), nullable=False, comment='Liquidity index at supply time (RAY)'),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    
+    if not _has_table('debt_positions'):
+        op.create_table(
+            'debt_positions',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('borrowed_asset_id', sa.String(length=100), nullable=False),
+            sa.Column('collateral_asset_id', sa.String(length=100), nullable=False),
+            sa.Column('principal', sa.BigInteger(), nullable=False),
+            sa.Column('borrow_index_at_open', sa.BigInteger(), nullable=False),
+            sa.Column('collateral_amount', sa.BigInteger(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+    
+    # Position lookups filter by user_id (and optionally asset_id)
+    supply_indexes = _index_names('supply_positions')
+    if 'ix_supply_positions_user_asset' not in supply_indexes:
+        op.create_index('ix_supply_positions_user_asset', 'supply_positions', ['user_id', 'asset_id'], unique=False)
+    if op.f('ix_supply_positions_asset_id') not in supply_indexes:
+        op.create_index(op.f('ix_supply_positions_asset_id'), 'supply_positions', ['asset_id'], unique=False)
+    # Redundant: user_id is the leading column of the composite index
+    if op.f('ix_supply_positions_user_id') in supply_indexes:
+        op.drop_index(op.f('ix_supply_positions_user_id'), table_name='supply_positions')
+    
+    if op.f('ix_debt_positions_user_id') not in _index_names('debt_positions'):
+        op.create_index(op.f('ix_debt_positions_user_id'), 'debt_positions', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Tables are left in place: they may predate this migration
+    op.drop_index(op.f('ix_debt_positions_user_id'), table_name='debt_positions')
+    op.drop_index(op.f('ix_supply_positions_asset_id'), table_name='supply_positions')
+    op.drop_index('ix_supply_positions_user_asset', table_name='supply_positions')
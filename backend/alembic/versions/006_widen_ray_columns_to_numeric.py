@@ -0,0 +1,68 @@
+"""widen RAY-scaled columns to NUMERIC(40, 0) and add non-negative checks
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-11-08
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors models.base.RayInteger: SQLite has no exact numeric type past 64
+# bits, so the digits are stored as text there
+RAY_TYPE = sa.Numeric(40, 0).with_variant(sa.String(40), 'sqlite')
+
+RAY_COLUMNS = {
+    'users': ['health_factor'],
+    'reserve_states': [
+        'liquidity_index',
+        'variable_borrow_index',
+        'current_liquidity_rate',
+        'current_variable_borrow_rate',
+        'reserve_factor',
+    ],
+    'supply_positions': ['liquidity_index_at_supply'],
+    'debt_positions': ['borrow_index_at_open'],
+}
+
+NON_NEGATIVE_COLUMNS = {
+    'supply_positions': ['atoken_amount', 'liquidity_index_at_supply'],
+    'debt_positions': ['principal', 'borrow_index_at_open', 'collateral_amount'],
+}
+
+
+def upgrade() -> None:
+    # batch mode rebuilds the table on SQLite, which cannot ALTER COLUMN TYPE
+    for table, columns in RAY_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.BigInteger(),
+                    type_=RAY_TYPE,
+                    postgresql_using=f'{column}::numeric(40, 0)',
+                )
+            for column in NON_NEGATIVE_COLUMNS.get(table, []):
+                batch_op.create_check_constraint(f'ck_{table}_{column}', f'{column} >= 0')
+
+
+def downgrade() -> None:
+    for table, columns in RAY_COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in NON_NEGATIVE_COLUMNS.get(table, []):
+                batch_op.drop_constraint(f'ck_{table}_{column}', type_='check')
+            for column in columns:
+                batch_op.alter_column(
+                    column,
+                    existing_type=RAY_TYPE,
+                    type_=sa.BigInteger(),
+                    postgresql_using=f'{column}::bigint',
+                )
@@ -0,0 +1,74 @@
+"""store transactions.tx_hash as 32 raw bytes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-11-08
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+transactions = sa.table(
+    'transactions',
+    sa.column('id', sa.Integer()),
+    sa.column('tx_hash', sa.LargeBinary()),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    # Read the hex hashes before the type change; only Postgres can decode
+    # them in place
+    existing = [] if is_postgres else bind.execute(
+        sa.text('SELECT id, tx_hash FROM transactions WHERE tx_hash IS NOT NULL')
+    ).fetchall()
+
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'tx_hash',
+            existing_type=sa.String(length=64),
+            type_=sa.LargeBinary(length=32),
+            existing_nullable=True,
+            postgresql_using="decode(tx_hash, 'hex')",
+        )
+
+    for row_id, tx_hash in existing:
+        bind.execute(
+            transactions.update()
+            .where(transactions.c.id == row_id)
+            .values(tx_hash=bytes.fromhex(tx_hash))
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    is_postgres = bind.dialect.name == 'postgresql'
+
+    existing = [] if is_postgres else bind.execute(
+        sa.text('SELECT id, tx_hash FROM transactions WHERE tx_hash IS NOT NULL')
+    ).fetchall()
+
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'tx_hash',
+            existing_type=sa.LargeBinary(length=32),
+            type_=sa.String(length=64),
+            existing_nullable=True,
+            postgresql_using="encode(tx_hash, 'hex')",
+        )
+
+    for row_id, tx_hash in existing:
+        bind.execute(
+            sa.text('UPDATE transactions SET tx_hash = :tx_hash WHERE id = :id'),
+            {'tx_hash': bytes(tx_hash).hex(), 'id': row_id},
+        )
@@ -0,0 +1,49 @@
+"""add composite indexes for transaction listings
+
+Revision ID: 008
+Revises: 007
+Create Date: 2025-11-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Each listing filters on one column and sorts by created_at DESC;
+    # serve them from a single index range scan instead of scan + sort
+    op.create_index(
+        'ix_tx_user_created',
+        'transactions',
+        ['user_address', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tx_asset_created',
+        'transactions',
+        ['asset_id', sa.text('created_at DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tx_status_created',
+        'transactions',
+        ['status', sa.text('created_at DESC')],
+        unique=False,
+    )
+    
+    # Redundant: asset_id is the leading column of ix_tx_asset_created
+    op.drop_index(op.f('ix_transactions_asset_id'), table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transactions_asset_id'), 'transactions', ['asset_id'], unique=False)
+    op.drop_index('ix_tx_status_created', table_name='transactions')
+    op.drop_index('ix_tx_asset_created', table_name='transactions')
+    op.drop_index('ix_tx_user_created', table_name='transactions')
@@ -0,0 +1,41 @@
+"""store transactions.metadata as JSON (JSONB on Postgres)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2025-11-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing values are JSON text already; Postgres parses them in place,
+    # elsewhere JSON is stored as text and only the declared type changes
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'metadata',
+            existing_type=sa.Text(),
+            type_=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            existing_nullable=True,
+            postgresql_using='metadata::jsonb',
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'metadata',
+            existing_type=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using='metadata::text',
+        )
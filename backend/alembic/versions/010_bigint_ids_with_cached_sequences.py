@@ -0,0 +1,56 @@
+"""widen user/transaction ids to BIGINT and cache their sequences
+
+Revision ID: 010
+Revises: 009
+Create Date: 2025-11-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs that hold user or transaction ids
+ID_COLUMNS = [
+    ('users', 'id'),
+    ('transactions', 'id'),
+    ('supply_positions', 'user_id'),
+    ('debt_positions', 'user_id'),
+]
+
+# Tables whose id sequence hands out values in cached blocks
+CACHED_SEQUENCES = ['users', 'transactions']
+
+
+def upgrade() -> None:
+    # SQLite ids are rowid aliases (already 64-bit) with no sequence object,
+    # so only Postgres has anything to change
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table, column in ID_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.Integer(), type_=sa.BigInteger())
+    
+    # Equivalent of Identity(cache=1000) on the models for the existing
+    # SERIAL sequences: one WAL-logged bump per 1000 inserts, not per insert
+    for table in CACHED_SEQUENCES:
+        op.execute(
+            f"ALTER SEQUENCE {table}_id_seq AS bigint MAXVALUE 9223372036854775807 CACHE 1000"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    
+    for table in CACHED_SEQUENCES:
+        op.execute(f"ALTER SEQUENCE {table}_id_seq AS integer MAXVALUE 2147483647 CACHE 1")
+    
+    for table, column in ID_COLUMNS:
+        op.alter_column(table, column, existing_type=sa.BigInteger(), type_=sa.Integer())
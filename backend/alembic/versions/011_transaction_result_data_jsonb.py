@@ -0,0 +1,40 @@
+"""store transactions.result_data as JSON (JSONB on Postgres)
+
+Revision ID: 011
+Revises: 010
+Create Date: 2025-11-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Same conversion as 009: the stored values are JSON text already
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'result_data',
+            existing_type=sa.Text(),
+            type_=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            existing_nullable=True,
+            postgresql_using='result_data::jsonb',
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('transactions') as batch_op:
+        batch_op.alter_column(
+            'result_data',
+            existing_type=sa.JSON().with_variant(postgresql.JSONB(), 'postgresql'),
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using='result_data::text',
+        )
@@ -0,0 +1,34 @@
+"""add a (tx_type, created_at) index for recent-by-type listings
+
+Revision ID: 012
+Revises: 011
+Create Date: 2025-11-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Recent transactions filtered by type, newest first, without a sort
+    op.create_index(
+        'ix_tx_type_created',
+        'transactions',
+        ['tx_type', sa.text('created_at DESC')],
+        unique=False,
+    )
+    
+    # Redundant: tx_type is the leading column of ix_tx_type_created
+    op.drop_index(op.f('ix_transactions_tx_type'), table_name='transactions')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_transactions_tx_type'), 'transactions', ['tx_type'], unique=False)
+    op.drop_index('ix_tx_type_created', table_name='transactions')
@@ -2,16 +2,55 @@
 FastAPI dependencies.
 """
 
-from typing import AsyncGenerator
+import asyncio
+from contextlib import AsyncExitStack
+from typing import Any, AsyncGenerator
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from ..config import settings
 
-# Create async engine
+
+def _engine_options(url: str) -> dict[str, Any]:
+    """
+    Build connection pool options for the async engine.
+    
+    In-memory SQLite databases live inside a single connection, so they get a
+    StaticPool; everything else uses a sized queue pool so connections are
+    reused across requests instead of reopened.
+    """
+    if url.startswith("sqlite") and ":memory:" in url:
+        return {
+            "poolclass": StaticPool,
+            "connect_args": {"check_same_thread": False},
+        }
+    
+    options: dict[str, Any] = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    elif url.startswith("postgresql+asyncpg"):
+        # Per-connection cache of server-side prepared statements, so hot
+        # queries skip the parse/plan round trip after first use
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+    return options
+
+
+# Create async engine (Settings has already mapped the URL onto an async driver)
 engine = create_async_engine(
-    settings.DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://"),
-    echo=settings.DEBUG,
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    **_engine_options(settings.DATABASE_URL),
 )
 
 # Create session factory
@@ -22,6 +61,23 @@ AsyncSessionLocal = async_sessionmaker(
 )
 
 
+async def warm_pool() -> None:
+    """
+    Open the pool's base connections ahead of the first requests.
+    
+    All connections are checked out at once so the pool really holds
+    ``pool_size`` of them afterwards, rather than one reused connection.
+    """
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return
+    
+    async with AsyncExitStack() as stack:
+        connections = await asyncio.gather(
+            *(stack.enter_async_context(engine.connect()) for _ in range(engine.pool.size()))
+        )
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in connections))
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session.
@@ -30,7 +86,4 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
         AsyncSession instance
     """
     async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+        yield session
@@ -2,16 +2,18 @@
 Error handling middleware for FastAPI.
 """
 
-from typing import Callable
-
-from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
+import orjson
+from fastapi import Response, status
 from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 
 class FantasmaException(Exception):
     """Base exception for Fantasma protocol errors."""
     
+    # Stored in slots so raising one doesn't populate an instance __dict__
+    __slots__ = ("message", "status_code", "error_code")
+    
     def __init__(
         self,
         message: str,
@@ -27,6 +29,8 @@ class FantasmaException(Exception):
 class InsufficientLiquidityError(FantasmaException):
     """Raised when reserve has insufficient liquidity."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Insufficient liquidity in reserve"):
         super().__init__(
             message=message,
@@ -38,6 +42,8 @@ class InsufficientLiquidityError(FantasmaException):
 class UnhealthyPositionError(FantasmaException):
     """Raised when position health factor is too low."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Position health factor below threshold"):
         super().__init__(
             message=message,
@@ -49,6 +55,8 @@ class UnhealthyPositionError(FantasmaException):
 class InvalidCollateralError(FantasmaException):
     """Raised when collateral is invalid or insufficient."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Invalid or insufficient collateral"):
         super().__init__(
             message=message,
@@ -60,6 +68,8 @@ class InvalidCollateralError(FantasmaException):
 class StaleOraclePriceError(FantasmaException):
     """Raised when oracle price is stale."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Oracle price is stale"):
         super().__init__(
             message=message,
@@ -71,6 +81,8 @@ class StaleOraclePriceError(FantasmaException):
 class UTXORaceConditionError(FantasmaException):
     """Raised when UTXO race condition detected."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "UTXO already spent, retry with updated state"):
         super().__init__(
             message=message,
@@ -82,6 +94,8 @@ class UTXORaceConditionError(FantasmaException):
 class PositionNotFoundError(FantasmaException):
     """Raised when position not found."""
     
+    __slots__ = ()
+    
     def __init__(self, message: str = "Position not found"):
         super().__init__(
             message=message,
@@ -90,58 +104,109 @@ class PositionNotFoundError(FantasmaException):
         )
 
 
-async def error_handler_middleware(
-    request: Request,
-    call_next: Callable
-) -> Response:
+class ReserveNotFoundError(FantasmaException):
+    """Raised when reserve not found."""
+    
+    __slots__ = ()
+    
+    def __init__(self, message: str = "Reserve not found"):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_404_NOT_FOUND,
+            error_code="RESERVE_NOT_FOUND",
+        )
+
+
+def _error_body(error_code: str, message: str) -> bytes:
+    """Encode the standard error payload."""
+    return orjson.dumps({"error": {"code": error_code, "message": message}})
+
+
+# Pre-encoded bodies for errors raised with their default message,
+# keyed by (error_code, message)
+_CANNED_BODIES: dict[tuple[str, str], bytes] = {
+    (exc.error_code, exc.message): _error_body(exc.error_code, exc.message)
+    for exc in (
+        InsufficientLiquidityError(),
+        UnhealthyPositionError(),
+        InvalidCollateralError(),
+        StaleOraclePriceError(),
+        UTXORaceConditionError(),
+        PositionNotFoundError(),
+        ReserveNotFoundError(),
+    )
+}
+
+_INTERNAL_ERROR_BODY = _error_body("INTERNAL_ERROR", "An internal error occurred")
+
+
+class ErrorHandlerMiddleware:
     """
-    Global error handling middleware.
+    Global error handling middleware (pure ASGI).
     
-    Catches all exceptions and returns structured JSON responses.
+    Catches all exceptions raised by the wrapped application and returns
+    structured JSON responses. Implemented as a raw ASGI callable instead of
+    a ``call_next`` middleware so requests are not wrapped in an extra task
+    and bodies are not buffered.
     """
-    try:
-        response = await call_next(request)
-        return response
-    
-    except FantasmaException as e:
-        logger.warning(
-            f"Fantasma error: {e.error_code} - {e.message} "
-            f"(path: {request.url.path})"
-        )
-        return JSONResponse(
-            status_code=e.status_code,
-            content={
-                "error": {
-                    "code": e.error_code,
-                    "message": e.message,
-                }
-            },
-        )
     
-    except ValueError as e:
-        logger.warning(f"Validation error: {str(e)} (path: {request.url.path})")
-        return JSONResponse(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            content={
-                "error": {
-                    "code": "VALIDATION_ERROR",
-                    "message": str(e),
-                }
-            },
-        )
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            if response_started:
+                # Headers already sent, nothing sensible left to return
+                raise
+            response = self._error_response(e, scope.get("path", ""))
+            await response(scope, receive, send)
     
-    except Exception as e:
+    @staticmethod
+    def _error_response(exc: Exception, path: str) -> Response:
+        """Build the JSON error response for an exception."""
+        if isinstance(exc, FantasmaException):
+            logger.warning(
+                f"Fantasma error: {exc.error_code} - {exc.message} "
+                f"(path: {path})"
+            )
+            body = _CANNED_BODIES.get((exc.error_code, exc.message))
+            if body is None:
+                body = _error_body(exc.error_code, exc.message)
+            return Response(
+                content=body,
+                status_code=exc.status_code,
+                media_type="application/json",
+            )
+        
+        if isinstance(exc, ValueError):
+            logger.warning(f"Validation error: {str(exc)} (path: {path})")
+            return Response(
+                content=_error_body("VALIDATION_ERROR", str(exc)),
+                status_code=status.HTTP_400_BAD_REQUEST,
+                media_type="application/json",
+            )
+        
         logger.error(
-            f"Unhandled exception: {type(e).__name__}: {str(e)} "
-            f"(path: {request.url.path})",
+            f"Unhandled exception: {type(exc).__name__}: {str(exc)} "
+            f"(path: {path})",
             exc_info=True,
         )
-        return JSONResponse(
+        return Response(
+            content=_INTERNAL_ERROR_BODY,
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": {
-                    "code": "INTERNAL_ERROR",
-                    "message": "An internal error occurred",
-                }
-            },
+            media_type="application/json",
         )
@@ -0,0 +1,41 @@
+"""
+Response classes for the API.
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel
+
+
+class FantasmaJSONResponse(ORJSONResponse):
+    """
+    orjson-backed JSON response with a stdlib fallback.
+    
+    orjson only serializes integers that fit in 64 bits, while RAY-precision
+    values (10^27) routinely exceed that. Payloads that trip the limit are
+    re-rendered with the standard library encoder; everything else takes the
+    orjson fast path.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            return JSONResponse.render(self, content)
+
+
+class ModelJSONResponse(Response):
+    """
+    Response rendered directly from a pydantic model by pydantic-core.
+    
+    pydantic-core's JSON serializer handles arbitrarily large integers, so
+    payloads carrying RAY values avoid the failed orjson attempt and the
+    stdlib re-render. Returning a Response also skips FastAPI's
+    response_model re-validation of a model the route just built.
+    """
+    
+    media_type = "application/json"
+    
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content)
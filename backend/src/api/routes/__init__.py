@@ -0,0 +1,18 @@
+"""
+API routers.
+
+Feature routers are aggregated into a single ``api_router`` so the app mounts
+the API once. Order matters: static paths such as ``/positions/liquidatable``
+must be registered before the ``/positions/{user_address}`` catch-all.
+"""
+
+from fastapi import APIRouter
+
+from . import borrow, liquidate, positions, reserves, supply
+
+api_router = APIRouter()
+api_router.include_router(supply.router, tags=["supply"])
+api_router.include_router(liquidate.router, tags=["liquidation"])
+api_router.include_router(positions.router, tags=["positions"])
+api_router.include_router(borrow.router, tags=["borrow"])
+api_router.include_router(reserves.router, tags=["reserves"])
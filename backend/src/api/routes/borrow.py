@@ -9,8 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from ...api.schemas.borrow import BorrowIntent, BorrowResponse, RepayIntent
 from ...services.debt_service import DebtService
 from ..dependencies import get_db_session
+from ..routing import JSONBodyRoute
 
-router = APIRouter()
+router = APIRouter(route_class=JSONBodyRoute)
 
 
 @router.post(
@@ -87,56 +88,37 @@ async def borrow_assets(
     session: AsyncSession = Depends(get_db_session),
 ) -> BorrowResponse:
     """Borrow assets by locking collateral."""
-    try:
-        logger.info(
-            f"Borrow request: user={intent.user_address}, "
-            f"collateral={intent.collateral_amount}, "
-            f"borrow={intent.borrow_amount}"
-        )
-        
-        debt_service = DebtService(session)
-        
-        # Create borrow position
-        position = await debt_service.borrow(
-            user_address=intent.user_address,
-            collateral_asset_id=intent.collateral_asset_id,
-            collateral_amount=intent.collateral_amount,
-            borrow_asset_id=intent.borrow_asset_id,
-            borrow_amount=intent.borrow_amount,
-        )
-        
-        # Calculate health factor
-        health_factor = await debt_service.calculate_health_factor(intent.user_address)
-        
-        logger.info(
-            f"Borrow successful: position_id={position.id}, "
-            f"health_factor={health_factor}"
-        )
-        
-        return BorrowResponse(
-            position_id=position.id,
-            user_address=intent.user_address,
-            collateral_asset_id=intent.collateral_asset_id,
-            collateral_amount=intent.collateral_amount,
-            borrowed_asset_id=intent.borrow_asset_id,
-            borrowed_amount=intent.borrow_amount,
-            health_factor=health_factor or 0,
-            tx_id=None,  # TODO: Implement actual transaction
-        )
+    logger.info(
+        "Borrow request: user={}, collateral={}, borrow={}",
+        intent.user_address, intent.collateral_amount, intent.borrow_amount,
+    )
+    
+    debt_service = DebtService(session)
+    
+    # Create borrow position (health factor is computed as part of it)
+    position, health_factor = await debt_service.borrow(
+        user_address=intent.user_address,
+        collateral_asset_id=intent.collateral_asset_id,
+        collateral_amount=intent.collateral_amount,
+        borrow_asset_id=intent.borrow_asset_id,
+        borrow_amount=intent.borrow_amount,
+    )
     
-    except ValueError as e:
-        logger.warning(f"Borrow validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    logger.info(
+        "Borrow successful: position_id={}, health_factor={}",
+        position.id, health_factor,
+    )
     
-    except Exception as e:
-        logger.error(f"Borrow error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process borrow"
-        )
+    return BorrowResponse(
+        position_id=position.id,
+        user_address=intent.user_address,
+        collateral_asset_id=intent.collateral_asset_id,
+        collateral_amount=intent.collateral_amount,
+        borrowed_asset_id=intent.borrow_asset_id,
+        borrowed_amount=intent.borrow_amount,
+        health_factor=health_factor or 0,
+        tx_id=None,  # TODO: Implement actual transaction
+    )
 
 
 @router.post("/repay", status_code=status.HTTP_200_OK)
@@ -160,8 +142,8 @@ async def repay_debt(
         HTTPException: Not implemented yet
     """
     logger.info(
-        f"Repay request: user={intent.user_address}, "
-        f"position={intent.position_id}, amount={intent.repay_amount}"
+        "Repay request: user={}, position={}, amount={}",
+        intent.user_address, intent.position_id, intent.repay_amount,
     )
     
     # TODO: Implement repayment logic
@@ -2,7 +2,10 @@
 Liquidation API routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,9 +15,40 @@ from ...api.schemas.liquidate import (
     LiquidationResponse,
 )
 from ...services.debt_service import DebtService
-from ..dependencies import get_db_session
+from ..dependencies import AsyncSessionLocal, get_db_session
+from ..routing import JSONBodyRoute
+
+router = APIRouter(route_class=JSONBodyRoute)
+
+
+def _encode(position: dict) -> bytes:
+    return LiquidatablePosition.model_construct(**position).model_dump_json().encode()
 
-router = APIRouter()
+
+async def _stream_json_array(
+    session: AsyncSession,
+    first: Optional[dict],
+    positions: AsyncIterator[dict],
+) -> AsyncIterator[bytes]:
+    """
+    Encode liquidatable positions as a JSON array, one element at a time.
+    
+    Owns the session the positions are read through and closes it once the
+    body has been sent (or the client has gone away).
+    """
+    try:
+        yield b"["
+        if first is not None:
+            yield _encode(first)
+            async for pos in positions:
+                yield b"," + _encode(pos)
+        yield b"]"
+    except Exception as e:
+        logger.exception("Error streaming liquidatable positions: {}", e)
+        raise
+    finally:
+        await positions.aclose()
+        await session.close()
 
 
 @router.get(
@@ -22,21 +56,26 @@ router = APIRouter()
     response_model=list[LiquidatablePosition],
     status_code=status.HTTP_200_OK,
 )
-async def get_liquidatable_positions(
-    session: AsyncSession = Depends(get_db_session),
-) -> list[LiquidatablePosition]:
+async def get_liquidatable_positions() -> StreamingResponse:
     """Return positions with health factor < 1.0."""
+    # The body is sent after the handler returns, so the stream gets its own
+    # session instead of relying on get_db_session outliving the response
+    session = AsyncSessionLocal()
+    positions = DebtService(session).stream_liquidatable_positions()
+    
+    # Pull the first row before any byte is sent, so failures in the index,
+    # oracle or cursor setup still reach the error middleware as a 5xx
     try:
-        debt_service = DebtService(session)
-        positions = await debt_service.get_liquidatable_positions()
-        return [LiquidatablePosition(**pos) for pos in positions]
-
-    except Exception as e:
-        logger.error(f"Error fetching liquidatable positions: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch liquidatable positions",
-        )
+        first = await anext(positions, None)
+    except Exception:
+        await positions.aclose()
+        await session.close()
+        raise
+    
+    return StreamingResponse(
+        _stream_json_array(session, first, positions),
+        media_type="application/json",
+    )
 
 
 @router.post(
@@ -49,26 +88,11 @@ async def liquidate_position(
     session: AsyncSession = Depends(get_db_session),
 ) -> LiquidationResponse:
     """Liquidate an unhealthy position."""
-    try:
-        debt_service = DebtService(session)
-        result = await debt_service.liquidate(
-            liquidator_address=intent.liquidator_address,
-            position_id=intent.position_id,
-            repay_amount=intent.repay_amount,
-        )
+    debt_service = DebtService(session)
+    result = await debt_service.liquidate(
+        liquidator_address=intent.liquidator_address,
+        position_id=intent.position_id,
+        repay_amount=intent.repay_amount,
+    )
 
-        return LiquidationResponse(**result)
-
-    except ValueError as e:
-        logger.warning(f"Liquidation validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
-
-    except Exception as e:
-        logger.error(f"Liquidation error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process liquidation",
-        )
+    return LiquidationResponse(**result)
@@ -2,12 +2,12 @@
 Position query API routes.
 """
 
-from datetime import datetime
+import time
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...api.schemas.supply import PositionResponse
@@ -18,6 +18,14 @@ from ..dependencies import get_db_session
 
 router = APIRouter()
 
+# Built once so every request reuses the same cached compiled form.
+# Joining on users filters by address without loading the User row.
+_SELECT_POSITIONS_BY_ADDRESS = (
+    select(SupplyPosition)
+    .join(User, SupplyPosition.user_id == User.id)
+    .where(User.address == bindparam("address"))
+)
+
 
 @router.get("/positions/{user_address}", response_model=List[PositionResponse])
 async def get_user_positions(
@@ -32,79 +40,64 @@ async def get_user_positions(
         session: Database session
     
     Returns:
-        List of position responses with current values
-    
-    Raises:
-        HTTPException: If user not found
+        List of position responses with current values (empty for unknown users)
     """
-    try:
-        logger.info(f"Fetching positions for user: {user_address}")
-        
-        # Get user
-        result = await session.execute(
-            select(User).where(User.address == user_address)
-        )
-        user = result.scalar_one_or_none()
-        
-        if not user:
-            # Return empty list if user doesn't exist yet
-            logger.info(f"User {user_address} not found, returning empty positions")
-            return []
+    logger.info("Fetching positions for user: {}", user_address)
+    
+    # Get the user's supply positions
+    result = await session.execute(
+        _SELECT_POSITIONS_BY_ADDRESS, {"address": user_address}
+    )
+    positions = result.scalars().all()
+    
+    if not positions:
+        # Unknown users simply have no positions yet
+        logger.info("No positions for user {}", user_address)
+        return []
+    
+    # Create reserve service for index queries
+    reserve_service = ReserveService(session)
+    
+    # Load every reserve referenced by the positions in one query
+    # (read-only, so short-lived cached copies are fine)
+    reserves = await reserve_service.get_cached_reserve_states(
+        position.asset_id for position in positions
+    )
+    now = int(time.time())
+    for reserve in reserves.values():
+        reserve_service.apply_accrued_interest(reserve, now)
+    
+    # Build responses with current values
+    responses = []
+    for position in positions:
+        reserve = reserves.get(position.asset_id)
+        if not reserve:
+            continue
         
-        # Get all supply positions
-        result = await session.execute(
-            select(SupplyPosition).where(SupplyPosition.user_id == user.id)
+        # Calculate current underlying amount
+        underlying_amount = position.calculate_underlying_amount(
+            reserve.liquidity_index
         )
-        positions = result.scalars().all()
         
-        # Create reserve service for index queries
-        reserve_service = ReserveService(session)
+        # Calculate accrued interest. At the supply-time index the
+        # underlying value equals the aToken amount exactly, so there is
+        # no need for a second RAY computation.
+        accrued_interest = underlying_amount - position.atoken_amount
         
-        # Build responses with current values
-        responses = []
-        for position in positions:
-            # Get current reserve state
-            reserve = await reserve_service.get_reserve_state_with_accrued_interest(
-                position.asset_id
-            )
-            
-            if not reserve:
-                continue
-            
-            # Calculate current underlying amount
-            underlying_amount = position.calculate_underlying_amount(
-                reserve.liquidity_index
-            )
-            
-            # Calculate accrued interest
-            initial_amount = position.calculate_underlying_amount(
-                position.liquidity_index_at_supply
-            )
-            accrued_interest = underlying_amount - initial_amount
-            
-            responses.append(
-                PositionResponse(
-                    position_id=position.id,
-                    user_address=user_address,
-                    asset_id=position.asset_id,
-                    atoken_amount=position.atoken_amount,
-                    underlying_amount=underlying_amount,
-                    accrued_interest=accrued_interest,
-                    liquidity_index_at_supply=position.liquidity_index_at_supply,
-                    current_liquidity_index=reserve.liquidity_index,
-                    created_at=position.created_at.isoformat(),
-                )
+        # Values are computed server-side from ORM rows, skip re-validation
+        responses.append(
+            PositionResponse.model_construct(
+                position_id=position.id,
+                user_address=user_address,
+                asset_id=position.asset_id,
+                atoken_amount=position.atoken_amount,
+                underlying_amount=underlying_amount,
+                accrued_interest=accrued_interest,
+                liquidity_index_at_supply=position.liquidity_index_at_supply,
+                current_liquidity_index=reserve.liquidity_index,
+                created_at=position.created_at,
             )
-        
-        logger.info(f"Found {len(responses)} positions for user {user_address}")
-        return responses
-    
-    except HTTPException:
-        raise
-    
-    except Exception as e:
-        logger.error(f"Error fetching positions: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch positions"
         )
+    
+    logger.info("Found {} positions for user {}", len(responses), user_address)
+    return responses
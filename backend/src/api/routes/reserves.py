@@ -1,11 +1,12 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from loguru import logger
+from fastapi import APIRouter, Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...models.reserve_state import ReserveState
+from ...services.reserve_service import ReserveService
+from ..middleware.error_handler import ReserveNotFoundError
 from ..schemas.reserves import ReserveResponse
 from ..dependencies import get_db_session
 
@@ -13,7 +14,8 @@ router = APIRouter()
 
 
 def _to_response(reserve: ReserveState) -> ReserveResponse:
-    return ReserveResponse(
+    # Values come straight from ORM columns, so skip re-validation
+    return ReserveResponse.model_construct(
         asset_id=reserve.asset_id,
         utxo_id=reserve.utxo_id,
         total_liquidity=reserve.total_liquidity,
@@ -32,16 +34,9 @@ def _to_response(reserve: ReserveState) -> ReserveResponse:
 async def get_reserves(
     session: AsyncSession = Depends(get_db_session),
 ) -> List[ReserveResponse]:
-    try:
-        result = await session.execute(select(ReserveState))
-        reserves = result.scalars().all()
-        return [_to_response(r) for r in reserves]
-    except Exception as e:
-        logger.error(f"Failed to fetch reserves: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch reserves",
-        )
+    result = await session.execute(select(ReserveState))
+    reserves = result.scalars().all()
+    return [_to_response(r) for r in reserves]
 
 
 @router.get("/reserves/{asset_id}", response_model=ReserveResponse)
@@ -49,19 +44,9 @@ async def get_reserve(
     asset_id: str,
     session: AsyncSession = Depends(get_db_session),
 ) -> ReserveResponse:
-    try:
-        result = await session.execute(
-            select(ReserveState).where(ReserveState.asset_id == asset_id)
-        )
-        reserve = result.scalar_one_or_none()
-        if not reserve:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Reserve not found")
-        return _to_response(reserve)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to fetch reserve {asset_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to fetch reserve",
-        )
+    # Read-only, so a short-lived cached copy (dropped on every write) is fine
+    reserve_service = ReserveService(session)
+    reserve = (await reserve_service.get_cached_reserve_states([asset_id])).get(asset_id)
+    if not reserve:
+        raise ReserveNotFoundError()
+    return _to_response(reserve)
@@ -2,7 +2,7 @@
 Supply operation API routes.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,8 +14,10 @@ from ...api.schemas.supply import (
 )
 from ...services.reserve_service import ReserveService
 from ..dependencies import get_db_session
+from ..responses import ModelJSONResponse
+from ..routing import JSONBodyRoute
 
-router = APIRouter()
+router = APIRouter(route_class=JSONBodyRoute)
 
 
 @router.post(
@@ -80,50 +82,36 @@ router = APIRouter()
 async def supply_assets(
     intent: SupplyIntent,
     session: AsyncSession = Depends(get_db_session),
-) -> SupplyResponse:
+) -> ModelJSONResponse:
     """Supply assets to lending pool and receive aTokens."""
-    try:
-        logger.info(
-            f"Supply request: user={intent.user_address}, "
-            f"asset={intent.asset_id[:8]}..., amount={intent.amount}"
-        )
-        
-        # Create reserve service
-        reserve_service = ReserveService(session)
-        
-        # Process supply
-        position = await reserve_service.supply(
-            user_address=intent.user_address,
-            asset_id=intent.asset_id,
-            amount=intent.amount,
-        )
-        
-        # Get updated reserve state
-        reserve = await reserve_service.get_reserve_state(intent.asset_id)
-        
-        return SupplyResponse(
-            position_id=position.id,
-            user_address=intent.user_address,
-            asset_id=intent.asset_id,
-            amount_supplied=intent.amount,
-            atoken_amount=position.atoken_amount,
-            liquidity_index=reserve.liquidity_index if reserve else 0,
-            tx_id=None,  # TODO: Implement actual transaction broadcast
-        )
+    # Lazy {} arguments: only formatted if INFO is actually emitted
+    logger.info(
+        "Supply request: user={}, asset={:.8}..., amount={}",
+        intent.user_address, intent.asset_id, intent.amount,
+    )
     
-    except ValueError as e:
-        logger.warning(f"Supply validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    # Create reserve service
+    reserve_service = ReserveService(session)
     
-    except Exception as e:
-        logger.error(f"Supply error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process supply"
-        )
+    # Process supply
+    position = await reserve_service.supply(
+        user_address=intent.user_address,
+        asset_id=intent.asset_id,
+        amount=intent.amount,
+    )
+    
+    # The position was minted at the freshly accrued index, so there is no
+    # need to read the reserve back
+    response = SupplyResponse(
+        position_id=position.id,
+        user_address=intent.user_address,
+        asset_id=intent.asset_id,
+        amount_supplied=intent.amount,
+        atoken_amount=position.atoken_amount,
+        liquidity_index=position.liquidity_index_at_supply,
+        tx_id=None,  # TODO: Implement actual transaction broadcast
+    )
+    return ModelJSONResponse(response, status_code=status.HTTP_201_CREATED)
 
 
 @router.post(
@@ -198,39 +186,26 @@ async def supply_assets(
 async def withdraw_assets(
     intent: WithdrawIntent,
     session: AsyncSession = Depends(get_db_session),
-) -> WithdrawResponse:
+) -> ModelJSONResponse:
     """Withdraw supplied assets by burning aTokens."""
-    try:
-        logger.info(
-            f"Withdraw request: user={intent.user_address}, "
-            f"asset={intent.asset_id[:8]}..., amount={intent.amount}"
-        )
-
-        reserve_service = ReserveService(session)
-        amount_withdrawn, atoken_burned, liquidity_index = await reserve_service.withdraw(
-            user_address=intent.user_address,
-            asset_id=intent.asset_id,
-            amount=intent.amount,
-        )
+    logger.info(
+        "Withdraw request: user={}, asset={:.8}..., amount={}",
+        intent.user_address, intent.asset_id, intent.amount,
+    )
 
-        return WithdrawResponse(
-            user_address=intent.user_address,
-            asset_id=intent.asset_id,
-            amount_withdrawn=amount_withdrawn,
-            atoken_burned=atoken_burned,
-            liquidity_index=liquidity_index,
-            tx_id=None,
-        )
+    reserve_service = ReserveService(session)
+    amount_withdrawn, atoken_burned, liquidity_index = await reserve_service.withdraw(
+        user_address=intent.user_address,
+        asset_id=intent.asset_id,
+        amount=intent.amount,
+    )
 
-    except ValueError as e:
-        logger.warning(f"Withdraw validation error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
-    except Exception as e:
-        logger.error(f"Withdraw error: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to process withdraw"
-        )
+    response = WithdrawResponse(
+        user_address=intent.user_address,
+        asset_id=intent.asset_id,
+        amount_withdrawn=amount_withdrawn,
+        atoken_burned=atoken_burned,
+        liquidity_index=liquidity_index,
+        tx_id=None,
+    )
+    return ModelJSONResponse(response)
@@ -0,0 +1,60 @@
+"""
+Custom route classes for the API routers.
+"""
+
+from typing import Callable, Coroutine, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, ValidationError
+
+
+def _is_json(content_type: Optional[str]) -> bool:
+    """Match the content types FastAPI itself decodes as JSON."""
+    if content_type is None:
+        return True
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type == "application/json" or (
+        media_type.startswith("application/") and media_type.endswith("+json")
+    )
+
+
+class JSONBodyRoute(APIRoute):
+    """
+    Route that validates a model request body straight from the raw bytes.
+
+    FastAPI normally runs json.loads on the body and then validates the
+    resulting dict. Here the body model is built with ``model_validate_json``
+    (parsed and validated in one pass by pydantic-core) and cached as the
+    request's JSON, so FastAPI's own validation receives a ready instance
+    and returns it unchanged.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[None, None, Response]]:
+        handler = super().get_route_handler()
+
+        # Only a single, non-embedded model body maps 1:1 onto the raw JSON
+        body_model: Optional[Type[BaseModel]] = None
+        body_params = self.dependant.body_params
+        if len(body_params) == 1 and not body_params[0].field_info.embed:
+            annotation = self.body_field.type_
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                body_model = annotation
+
+        if body_model is None:
+            return handler
+
+        async def route_handler(request: Request) -> Response:
+            body = await request.body()
+            if body and _is_json(request.headers.get("content-type")):
+                try:
+                    request._json = body_model.model_validate_json(body)
+                except ValidationError as e:
+                    raise RequestValidationError(
+                        [{**err, "loc": ("body", *err["loc"])} for err in e.errors()],
+                        body=body,
+                    ) from e
+            return await handler(request)
+
+        return route_handler
@@ -4,22 +4,20 @@ Pydantic schemas for borrow operations.
 
 from pydantic import BaseModel, Field
 
+from .common import AssetId, LiquidAddress
+
 
 class BorrowIntent(BaseModel):
     """Intent to borrow assets against collateral."""
     
-    user_address: str = Field(
+    user_address: LiquidAddress = Field(
         ...,
-        description="User's Liquid address",
-        min_length=10,
-        max_length=100
+        description="User's Liquid address"
     )
     
-    collateral_asset_id: str = Field(
+    collateral_asset_id: AssetId = Field(
         ...,
-        description="Asset used as collateral",
-        min_length=10,
-        max_length=100
+        description="Asset used as collateral"
     )
     
     collateral_amount: int = Field(
@@ -28,11 +26,9 @@ class BorrowIntent(BaseModel):
         gt=0
     )
     
-    borrow_asset_id: str = Field(
+    borrow_asset_id: AssetId = Field(
         ...,
-        description="Asset to borrow",
-        min_length=10,
-        max_length=100
+        description="Asset to borrow"
     )
     
     borrow_amount: int = Field(
@@ -45,11 +41,9 @@ class BorrowIntent(BaseModel):
 class RepayIntent(BaseModel):
     """Intent to repay borrowed assets."""
     
-    user_address: str = Field(
+    user_address: LiquidAddress = Field(
         ...,
-        description="User's Liquid address",
-        min_length=10,
-        max_length=100
+        description="User's Liquid address"
     )
     
     position_id: int = Field(
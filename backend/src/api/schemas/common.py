@@ -0,0 +1,11 @@
+"""
+Shared field types for request schemas.
+"""
+
+from typing import Annotated
+
+from pydantic import StringConstraints
+
+# Defined once so every schema reuses the same constraint (and core schema)
+LiquidAddress = Annotated[str, StringConstraints(min_length=10, max_length=100)]
+AssetId = Annotated[str, StringConstraints(min_length=10, max_length=100)]
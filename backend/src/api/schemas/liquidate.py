@@ -4,15 +4,15 @@ Pydantic schemas for liquidation operations.
 
 from pydantic import BaseModel, Field
 
+from .common import LiquidAddress
+
 
 class LiquidateIntent(BaseModel):
     """Intent to liquidate an unhealthy debt position."""
 
-    liquidator_address: str = Field(
+    liquidator_address: LiquidAddress = Field(
         ...,
         description="Liquidator's Liquid address",
-        min_length=10,
-        max_length=100,
     )
 
     position_id: int = Field(
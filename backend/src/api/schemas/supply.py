@@ -2,7 +2,11 @@
 Pydantic schemas for supply operations.
 """
 
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from .common import AssetId, LiquidAddress
 
 
 class SupplyIntent(BaseModel):
@@ -16,40 +20,26 @@ class SupplyIntent(BaseModel):
         signature: Transaction signature (optional for MVP)
     """
     
-    user_address: str = Field(
+    user_address: LiquidAddress = Field(
         ...,
-        description="User's Liquid address",
-        min_length=10,
-        max_length=100
+        description="User's Liquid address"
     )
     
-    asset_id: str = Field(
+    asset_id: AssetId = Field(
         ...,
-        description="Liquid asset ID (hex)",
-        min_length=10,
-        max_length=100
+        description="Liquid asset ID (hex)"
     )
     
     amount: int = Field(
         ...,
-        description="Amount to supply (satoshis)",
-        gt=0
+        description="Amount to supply (satoshis, minimum 1000)",
+        ge=1000
     )
     
     signature: str | None = Field(
         default=None,
         description="Transaction signature (optional)"
     )
-    
-    @field_validator('amount')
-    @classmethod
-    def validate_amount(cls, v: int) -> int:
-        """Validate supply amount is positive."""
-        if v <= 0:
-            raise ValueError("Amount must be positive")
-        if v < 1000:  # Minimum 1000 satoshis
-            raise ValueError("Amount must be at least 1000 satoshis")
-        return v
 
 
 class WithdrawIntent(BaseModel):
@@ -63,18 +53,14 @@ class WithdrawIntent(BaseModel):
         signature: Transaction signature (optional for MVP)
     """
     
-    user_address: str = Field(
+    user_address: LiquidAddress = Field(
         ...,
-        description="User's Liquid address",
-        min_length=10,
-        max_length=100
+        description="User's Liquid address"
     )
     
-    asset_id: str = Field(
+    asset_id: AssetId = Field(
         ...,
-        description="Liquid asset ID (hex)",
-        min_length=10,
-        max_length=100
+        description="Liquid asset ID (hex)"
     )
     
     amount: int = Field(
@@ -163,7 +149,7 @@ class PositionResponse(BaseModel):
     accrued_interest: int
     liquidity_index_at_supply: int
     current_liquidity_index: int
-    created_at: str
+    created_at: datetime
     
     class Config:
         from_attributes = True
@@ -4,8 +4,18 @@ Configuration management using Pydantic settings.
 
 from typing import List
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .utils import ray_math
+
+# Plain driver schemes and the async drivers the engine actually runs on
+_ASYNC_DRIVERS = (
+    ("sqlite://", "sqlite+aiosqlite://"),
+    ("postgresql://", "postgresql+asyncpg://"),
+    ("postgres://", "postgresql+asyncpg://"),
+)
+
 
 class Settings(BaseSettings):
     """
@@ -22,6 +32,7 @@ class Settings(BaseSettings):
     ELEMENTS_RPC_URL: str = "http://127.0.0.1:18884"
     ELEMENTS_RPC_USER: str = "liquiduser"
     ELEMENTS_RPC_PASSWORD: str = "liquidpass"
+    ELEMENTS_RPC_MAX_INFLIGHT: int = 16  # concurrent RPCs per client
     NETWORK: str = "regtest"
     
     # Asset IDs (generated during setup)
@@ -29,7 +40,16 @@ class Settings(BaseSettings):
     USDT_ASSET_ID: str = ""
     
     # Database
-    DATABASE_URL: str = "sqlite:///./fantasma.db"
+    DATABASE_URL: str = "sqlite+aiosqlite:///./fantasma.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # 30 minutes
+    DB_ECHO: bool = False
+    DB_QUERY_CACHE_SIZE: int = 1200  # compiled statement cache entries
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # asyncpg, per connection
+    
+    # Redis (shared UTXO locks across workers; empty keeps locks in-process)
+    REDIS_URL: str = ""
     
     # API
     API_HOST: str = "0.0.0.0"
@@ -42,8 +62,8 @@ class Settings(BaseSettings):
     ORACLE_STALENESS_THRESHOLD: int = 600  # 10 minutes
     
     # Protocol Parameters (RAY precision)
-    RAY: int = 10**27
-    SECONDS_PER_YEAR: int = 31536000
+    RAY: int = ray_math.RAY
+    SECONDS_PER_YEAR: int = ray_math.SECONDS_PER_YEAR
     
     # Liquidation parameters
     LIQUIDATION_THRESHOLD: int = 800000000000000000000000000  # 0.8 * RAY (80%)
@@ -63,6 +83,22 @@ class Settings(BaseSettings):
     # Development
     DEBUG: bool = False
     TEST_MODE: bool = False
+    SIMULATE_NETWORK_DELAY: float = 0.0  # seconds added to simulated broadcasts
+    
+    @field_validator("DATABASE_URL")
+    @classmethod
+    def use_async_driver(cls, url: str) -> str:
+        """
+        Rewrite plain database URLs onto their async driver.
+        
+        SQLite (aiosqlite) is meant for local development only: it serialises
+        writers behind a single file lock. Use PostgreSQL (asyncpg) wherever
+        concurrent borrows and liquidations matter.
+        """
+        for prefix, async_prefix in _ASYNC_DRIVERS:
+            if url.startswith(prefix):
+                return async_prefix + url[len(prefix):]
+        return url
 
 
 # Global settings instance
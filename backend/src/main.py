@@ -6,8 +6,18 @@ AAVE-inspired lending protocol on Liquid Network with formal verification.
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from loguru import logger
 
+from .api.dependencies import engine, warm_pool
+from .api.middleware.error_handler import ErrorHandlerMiddleware
+from .api.responses import FantasmaJSONResponse
+from .api.routes import api_router
 from .config import settings
+from .services.coordinator import UTXOLock
+from .services.reserve_service import drain_background_tasks
+from .utils.liquid_client import liquid_client
+from .utils.logger import setup_logging
 
 # Create FastAPI app
 app = FastAPI(
@@ -16,8 +26,18 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=FantasmaJSONResponse,
 )
 
+app.include_router(api_router, prefix="/api/v1")
+
+# Structured error responses (added first so CORS wraps error responses too)
+app.add_middleware(ErrorHandlerMiddleware)
+
+# Compress larger payloads; RAY-scaled indices are long digit runs that
+# gzip well, while small bodies are not worth the CPU
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -28,6 +48,26 @@ app.add_middleware(
 )
 
 
+@app.on_event("startup")
+async def startup() -> None:
+    """Configure logging, open database connections and build the OpenAPI schema before serving traffic."""
+    setup_logging()
+    await warm_pool()
+    # Cached on the app; otherwise built on the first /docs or /openapi.json hit
+    app.openapi()
+
+
+@app.on_event("shutdown")
+async def shutdown() -> None:
+    """Finish background broadcasts, close pooled database, Redis and Elements RPC connections and flush queued log records."""
+    # Broadcasts use the engine, locks and RPC client closed below
+    await drain_background_tasks()
+    await engine.dispose()
+    await UTXOLock.close()
+    await liquid_client.aclose()
+    await logger.complete()
+
+
 @app.get("/")
 async def root() -> dict[str, str]:
     """Root endpoint - API health check."""
@@ -45,17 +85,15 @@ async def health() -> dict[str, str]:
     return {"status": "healthy"}
 
 
-# Import and include routers
-from .api.routes import supply, positions, borrow, liquidate, reserves
-
-app.include_router(supply.router, prefix="/api/v1", tags=["supply"])
-app.include_router(positions.router, prefix="/api/v1", tags=["positions"])
-app.include_router(borrow.router, prefix="/api/v1", tags=["borrow"])
-app.include_router(liquidate.router, prefix="/api/v1", tags=["liquidation"])
-app.include_router(reserves.router, prefix="/api/v1", tags=["reserves"])
-
-# TODO: Add remaining routers as user stories are implemented
-# from .api.routes import borrow, liquidate, reserves
-# app.include_router(borrow.router, prefix="/api/v1", tags=["borrow"])
-# app.include_router(liquidate.router, prefix="/api/v1", tags=["liquidate"])
-# app.include_router(reserves.router, prefix="/api/v1", tags=["reserves"])
+if __name__ == "__main__":
+    import uvicorn
+    
+    # uvloop/httptools come with uvicorn[standard]; pin them rather than
+    # relying on auto-detection falling back to the pure-Python loop
+    uvicorn.run(
+        "src.main:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        loop="uvloop",
+        http="httptools",
+    )
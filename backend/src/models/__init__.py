@@ -0,0 +1,12 @@
+"""
+SQLAlchemy models.
+
+All model modules are imported here so the declarative registry is complete
+(string relationship targets resolve) as soon as any model is imported.
+"""
+
+from .base import Base
+from .debt_position import DebtPosition
+from .reserve_state import ReserveState
+from .supply_position import SupplyPosition
+from .user import User
@@ -3,10 +3,18 @@ Base SQLAlchemy models and mixins.
 """
 
 from datetime import datetime
-from typing import Any
+from decimal import Decimal
+from typing import Any, Optional
 
-from sqlalchemy import DateTime, func
+from sqlalchemy import BigInteger, DateTime, Integer, Numeric, String, func
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+# 64-bit surrogate keys. SQLite only auto-increments a column declared
+# exactly INTEGER PRIMARY KEY (the rowid alias), which is 64-bit anyway.
+BigIntId = BigInteger().with_variant(Integer(), "sqlite")
 
 
 class Base(DeclarativeBase):
@@ -29,3 +37,37 @@ class TimestampMixin:
         onupdate=func.now(),
         nullable=False
     )
+
+
+class RayInteger(TypeDecorator):
+    """
+    Exact integer column wide enough for RAY-scaled values (10^27 and up).
+    
+    Stored as NUMERIC(40, 0). SQLite has no exact numeric type beyond 64
+    bits (larger values decay to REAL), so there the digits are kept as
+    text. Either way values round-trip as Python ints.
+    
+    Warning: on SQLite, SQL-side operations on these columns are unsafe.
+    ORDER BY, comparisons and MIN/MAX compare the text lexicographically
+    ("9" > "10"), and arithmetic coerces it to REAL and loses precision.
+    Only PostgreSQL's NUMERIC gives correct results in SQL. On SQLite,
+    load the values and compare or compute in Python.
+    """
+    
+    impl = Numeric(40, 0)
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String(40))
+        return dialect.type_descriptor(Numeric(40, 0))
+    
+    def process_bind_param(self, value: Optional[int], dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        if dialect.name == "sqlite":
+            return str(int(value))
+        return Decimal(int(value))
+    
+    def process_result_value(self, value: Any, dialect: Dialect) -> Optional[int]:
+        return None if value is None else int(value)
@@ -8,11 +8,11 @@ Tracks principal, accrued interest, and collateral.
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import BigInteger, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, CheckConstraint, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, TimestampMixin
-from ..utils.ray_math import RAY, ray_mul, ray_div
+from .base import Base, BigIntId, RayInteger, TimestampMixin
+from ..utils.ray_math import RAY, ray_scale
 
 
 class DebtPosition(Base, TimestampMixin):
@@ -41,7 +41,7 @@ class DebtPosition(Base, TimestampMixin):
     __tablename__ = "debt_positions"
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id: Mapped[int] = mapped_column(BigIntId, ForeignKey("users.id"), nullable=False, index=True)
     
     # Asset identifiers
     borrowed_asset_id: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -49,7 +49,7 @@ class DebtPosition(Base, TimestampMixin):
     
     # Debt tracking
     principal: Mapped[int] = mapped_column(BigInteger, nullable=False)
-    borrow_index_at_open: Mapped[int] = mapped_column(BigInteger, nullable=False, default=RAY)
+    borrow_index_at_open: Mapped[int] = mapped_column(RayInteger, nullable=False, default=RAY)
     
     # Collateral tracking
     collateral_amount: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -57,6 +57,12 @@ class DebtPosition(Base, TimestampMixin):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="debt_positions")
     
+    __table_args__ = (
+        CheckConstraint("principal >= 0", name="ck_debt_positions_principal"),
+        CheckConstraint("borrow_index_at_open >= 0", name="ck_debt_positions_borrow_index_at_open"),
+        CheckConstraint("collateral_amount >= 0", name="ck_debt_positions_collateral_amount"),
+    )
+    
     def calculate_current_debt(self, current_borrow_index: int) -> int:
         """
         Calculate current debt including accrued interest.
@@ -70,15 +76,33 @@ class DebtPosition(Base, TimestampMixin):
         Returns:
             Current debt amount in satoshis
         """
-        if self.borrow_index_at_open == 0:
-            return self.principal
-        
-        # Use RAY math for precision
-        return ray_mul(
-            self.principal,
-            ray_div(current_borrow_index, self.borrow_index_at_open)
+        return self.scale_debt(
+            self.principal, current_borrow_index, self.borrow_index_at_open
         )
     
+    @staticmethod
+    def scale_debt(principal: int, current_borrow_index: int, borrow_index_at_open: int) -> int:
+        """
+        Calculate current debt from raw column values.
+        
+        Lets bulk scans work on selected columns without hydrating
+        DebtPosition objects.
+        
+        Args:
+            principal: Original borrowed amount (satoshis)
+            current_borrow_index: Current variableBorrowIndex from reserve
+            borrow_index_at_open: variableBorrowIndex when position opened
+        
+        Returns:
+            Current debt amount in satoshis
+        """
+        # Unset opening index, or no interest accrued since the position opened
+        if borrow_index_at_open == 0 or current_borrow_index == borrow_index_at_open:
+            return principal
+        
+        # Single multiply/divide instead of ray_div followed by ray_mul
+        return ray_scale(principal, current_borrow_index, borrow_index_at_open)
+    
     def calculate_accrued_interest(self, current_borrow_index: int) -> int:
         """
         Calculate accrued interest on debt.
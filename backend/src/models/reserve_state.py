@@ -7,7 +7,8 @@ from datetime import datetime
 from sqlalchemy import BigInteger, DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from .base import Base, TimestampMixin
+from .base import Base, RayInteger, TimestampMixin
+from ..utils.ray_math import RAY
 
 
 class ReserveState(Base, TimestampMixin):
@@ -68,27 +69,27 @@ class ReserveState(Base, TimestampMixin):
     
     # Cumulative indices (RAY precision 10^27)
     liquidity_index: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         comment="Cumulative supply interest index (RAY)"
     )
     
     variable_borrow_index: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         comment="Cumulative borrow interest index (RAY)"
     )
     
     # Current rates (RAY precision, per second)
     current_liquidity_rate: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         default=0,
         comment="Current supply rate per second (RAY)"
     )
     
     current_variable_borrow_rate: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         default=0,
         comment="Current borrow rate per second (RAY)"
@@ -103,7 +104,7 @@ class ReserveState(Base, TimestampMixin):
     
     # Protocol fee (RAY precision)
     reserve_factor: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         comment="Protocol fee percentage (RAY)"
     )
@@ -124,7 +125,6 @@ class ReserveState(Base, TimestampMixin):
         if self.total_liquidity == 0:
             return 0
         
-        from ..utils.ray_math import RAY
         return (self.total_borrowed * RAY) // self.total_liquidity
     
     def __repr__(self) -> str:
@@ -2,10 +2,10 @@
 SupplyPosition model for tracking user supply positions.
 """
 
-from sqlalchemy import BigInteger, ForeignKey, String
+from sqlalchemy import BigInteger, CheckConstraint, ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, TimestampMixin
+from .base import Base, BigIntId, RayInteger, TimestampMixin
 
 
 class SupplyPosition(Base, TimestampMixin):
@@ -30,9 +30,9 @@ class SupplyPosition(Base, TimestampMixin):
     
     # Foreign key to users table
     user_id: Mapped[int] = mapped_column(
+        BigIntId,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True
     )
     
     # Asset being supplied (Liquid asset ID)
@@ -52,7 +52,7 @@ class SupplyPosition(Base, TimestampMixin):
     
     # Liquidity index when position was created (for interest calculation)
     liquidity_index_at_supply: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=False,
         comment="Liquidity index at supply time (RAY)"
     )
@@ -60,6 +60,17 @@ class SupplyPosition(Base, TimestampMixin):
     # Relationship to User
     user: Mapped["User"] = relationship("User", back_populates="supply_positions")
     
+    # Per-user position lookups (optionally narrowed by asset) are served
+    # from one index; user_id alone is covered by its leading column
+    __table_args__ = (
+        Index("ix_supply_positions_user_asset", user_id, asset_id),
+        CheckConstraint("atoken_amount >= 0", name="ck_supply_positions_atoken_amount"),
+        CheckConstraint(
+            "liquidity_index_at_supply >= 0",
+            name="ck_supply_positions_liquidity_index_at_supply",
+        ),
+    )
+    
     def calculate_underlying_amount(self, current_liquidity_index: int) -> int:
         """
         Calculate current underlying asset amount.
@@ -72,14 +83,38 @@ class SupplyPosition(Base, TimestampMixin):
         Returns:
             Underlying asset amount in satoshis
         """
-        from ..utils.ray_math import ray_mul, ray_div, RAY
+        return self.scale_underlying(
+            self.atoken_amount, current_liquidity_index, self.liquidity_index_at_supply
+        )
+    
+    @staticmethod
+    def scale_underlying(
+        atoken_amount: int,
+        current_liquidity_index: int,
+        liquidity_index_at_supply: int
+    ) -> int:
+        """
+        Calculate current underlying amount from raw column values.
         
-        # Normalize aToken to underlying
-        # underlying = atoken * (current_index / initial_index)
-        index_ratio = ray_div(current_liquidity_index, self.liquidity_index_at_supply)
-        underlying = ray_mul(self.atoken_amount * RAY, index_ratio) // RAY
+        Lets bulk reads work on selected columns without hydrating
+        SupplyPosition objects.
         
-        return underlying
+        Args:
+            atoken_amount: aToken balance (satoshis)
+            current_liquidity_index: Current reserve liquidity index
+            liquidity_index_at_supply: Liquidity index when supplied
+        
+        Returns:
+            Underlying asset amount in satoshis
+        """
+        # No interest accrued since supply (e.g. a fresh position)
+        if current_liquidity_index == liquidity_index_at_supply:
+            return atoken_amount
+        
+        # Normalize aToken to underlying
+        # underlying = atoken * (current_index / initial_index), rounded down
+        # in one multiply/divide rather than ray_div followed by ray_mul
+        return atoken_amount * current_liquidity_index // liquidity_index_at_supply
     
     def __repr__(self) -> str:
         return (
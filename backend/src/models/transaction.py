@@ -5,10 +5,11 @@ Transaction history model for audit logging.
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Text
+from sqlalchemy import JSON, Column, Identity, Integer, String, DateTime, BigInteger, Index, LargeBinary, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
-from .base import Base
+from .base import Base, BigIntId
 
 
 class TransactionType(str, Enum):
@@ -36,26 +37,27 @@ class Transaction(Base):
     
     __tablename__ = "transactions"
     
-    # Primary key
-    id = Column(Integer, primary_key=True, autoincrement=True)
+    # Primary key (identity values allocated in cached blocks)
+    id = Column(BigIntId, Identity(cache=1000), primary_key=True)
     
     # Transaction identification
-    tx_hash = Column(String(64), nullable=True, index=True)  # On-chain transaction hash
-    tx_type = Column(String(20), nullable=False, index=True)  # Transaction type
+    tx_hash = Column(LargeBinary(32), nullable=True, index=True)  # On-chain transaction hash (raw 32 bytes)
+    tx_type = Column(String(20), nullable=False)  # Transaction type
     status = Column(String(20), nullable=False, default="pending")  # Status
     
     # User information
-    user_address = Column(String(100), nullable=False, index=True)  # Initiator
+    user_address = Column(String(100), nullable=False)  # Initiator
     
     # Asset information
-    asset_id = Column(String(64), nullable=False, index=True)  # Primary asset
+    asset_id = Column(String(64), nullable=False)  # Primary asset
     amount = Column(BigInteger, nullable=False)  # Transaction amount (satoshis)
     
-    # Additional context (JSON-serialized)
-    metadata = Column(Text, nullable=True)  # JSON with tx-specific data
+    # Additional context; "metadata" is reserved on declarative classes, so
+    # the attribute is renamed while the column keeps its name
+    tx_metadata = Column("metadata", JSON().with_variant(JSONB(), "postgresql"), nullable=True)
     
     # Results
-    result_data = Column(Text, nullable=True)  # JSON with result details
+    result_data = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Result details
     error_message = Column(Text, nullable=True)  # Error if failed
     
     # Timestamps
@@ -66,6 +68,17 @@ class Transaction(Base):
     position_id = Column(Integer, nullable=True)  # Related position if applicable
     reserve_asset_id = Column(String(64), nullable=True)  # Related reserve
     
+    __table_args__ = (
+        # User history: filter by user (and type), newest first
+        Index("ix_tx_user_type_created", user_address, tx_type, created_at.desc()),
+        # Untyped user history; the index above would need a sort
+        Index("ix_tx_user_created", user_address, created_at.desc()),
+        # Asset history and recent-by-status/type listings, newest first
+        Index("ix_tx_asset_created", asset_id, created_at.desc()),
+        Index("ix_tx_status_created", status, created_at.desc()),
+        Index("ix_tx_type_created", tx_type, created_at.desc()),
+    )
+    
     def __repr__(self) -> str:
         return (
             f"<Transaction(id={self.id}, type={self.tx_type}, "
@@ -77,13 +90,13 @@ class Transaction(Base):
         """Convert to dictionary for API responses."""
         return {
             "id": self.id,
-            "tx_hash": self.tx_hash,
+            "tx_hash": self.tx_hash.hex() if self.tx_hash else None,
             "tx_type": self.tx_type,
             "status": self.status,
             "user_address": self.user_address,
             "asset_id": self.asset_id,
             "amount": self.amount,
-            "metadata": self.metadata,
+            "metadata": self.tx_metadata,
             "result_data": self.result_data,
             "error_message": self.error_message,
             "created_at": self.created_at.isoformat() if self.created_at else None,
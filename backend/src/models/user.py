@@ -2,10 +2,10 @@
 User model for tracking protocol participants.
 """
 
-from sqlalchemy import BigInteger, String
+from sqlalchemy import Identity, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from .base import Base, TimestampMixin
+from .base import Base, BigIntId, RayInteger, TimestampMixin
 
 
 class User(Base, TimestampMixin):
@@ -22,7 +22,9 @@ class User(Base, TimestampMixin):
     
     __tablename__ = "users"
     
-    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # Identity values are handed out in cached blocks, not one sequence
+    # round trip per insert
+    id: Mapped[int] = mapped_column(BigIntId, Identity(cache=1000), primary_key=True)
     
     # Liquid address (e.g., lq1q...)
     address: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
@@ -31,7 +33,7 @@ class User(Base, TimestampMixin):
     # health_factor = (collateral_value * liquidation_threshold) / debt_value
     # Healthy if >= 1.0 * RAY
     health_factor: Mapped[int] = mapped_column(
-        BigInteger,
+        RayInteger,
         nullable=True,
         comment="Health factor in RAY precision (10^27)"
     )
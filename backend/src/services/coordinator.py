@@ -5,38 +5,109 @@ Handles the assembly and broadcasting of UTXO transactions for supply operations
 Manages UTXO locks to prevent race conditions.
 
 This is a simplified MVP implementation. Production version would need:
-- Distributed locking (Redis)
 - Transaction queue management
 - Retry logic with exponential backoff
 - UTXO selection optimization
 - Fee estimation
 """
 
-from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import asyncio
+import hashlib
+import heapq
+import itertools
+import secrets
+import time
 
 from loguru import logger
+from redis import asyncio as aioredis
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from ..config import settings
 from ..models.reserve_state import ReserveState
 from ..models.supply_position import SupplyPosition
-from ..utils.liquid_client import LiquidClient
+from ..utils.liquid_client import LiquidClient, liquid_client as shared_liquid_client
+from .reserve_cache import invalidate_reserve_cache
+
+
+# Simulated txids hash a per-process random seed plus a counter, so they
+# stay unique without formatting a timestamp into every preimage
+_SIMULATED_TX_SEED = hashlib.sha256(secrets.token_bytes(16))
+_simulated_tx_counter = itertools.count()
+
+
+@lru_cache(maxsize=None)
+def _operation_hasher(operation: str) -> "hashlib._Hash":
+    """Seeded hasher with the operation label already absorbed, built once per operation."""
+    sha = _SIMULATED_TX_SEED.copy()
+    sha.update(operation.encode())
+    sha.update(b":")
+    return sha
+
+
+def _simulated_tx_id(operation: str, *parts: object) -> str:
+    """Derive a unique fake transaction ID from the operation's fields."""
+    sha = _operation_hasher(operation).copy()
+    for part in parts:
+        sha.update(str(part).encode())
+        sha.update(b":")
+    sha.update(next(_simulated_tx_counter).to_bytes(8, "big"))
+    return sha.hexdigest()
+
+
+def reserve_lock_key(asset_id: str) -> str:
+    """
+    Lock key for a reserve's UTXO.
+    
+    Keyed by asset rather than by the current utxo_id, which changes on
+    every broadcast: all operations on one reserve must contend for the
+    same key regardless of which UTXO they saw.
+    """
+    return f"reserve_{asset_id}"
 
 
 class UTXOLock:
     """
-    Simple in-memory UTXO lock for MVP.
+    Expiring lock on reserve UTXOs.
+    
+    With REDIS_URL configured the lock is a Redis key (SET NX PX), so it
+    holds across every worker process and expires on its own after
+    LOCK_TTL_MS. Without Redis, locks fall back to an in-process dict,
+    which is only correct for a single worker.
+    
+    acquire() returns a token that must be handed back to release(), so a
+    holder whose lease already expired cannot release someone else's lock.
+    """
     
-    Production should use Redis or similar distributed lock.
+    # Used only through classmethods; never instantiated
+    __slots__ = ()
+    
+    LOCK_TTL_MS = 30_000
+    KEY_PREFIX = "utxo:"
+    
+    # Delete the key only if it still holds our token (compare-and-delete)
+    _RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
     """
     
-    _locks: dict[str, datetime] = {}
-    _lock_timeout = timedelta(seconds=30)
+    _redis: Optional[aioredis.Redis] = None
+    _local_locks: dict[str, tuple[str, int]] = {}  # utxo_id -> (token, expiry ns)
+    _local_expiries: list[tuple[int, str]] = []  # min-heap of (expiry ns, utxo_id)
+    
+    @classmethod
+    def _client(cls) -> Optional[aioredis.Redis]:
+        """Return the shared Redis client, or None when Redis is not configured."""
+        if cls._redis is None and settings.REDIS_URL:
+            cls._redis = aioredis.from_url(settings.REDIS_URL)
+        return cls._redis
     
     @classmethod
-    def acquire(cls, utxo_id: str) -> bool:
+    async def acquire(cls, utxo_id: str) -> Optional[str]:
         """
         Try to acquire lock on UTXO.
         
@@ -44,29 +115,107 @@ class UTXOLock:
             utxo_id: UTXO identifier
             
         Returns:
-            True if lock acquired, False if already locked
+            Lock token if acquired, None if already locked
         """
-        now = datetime.utcnow()
+        token = secrets.token_hex(16)
         
-        # Clean expired locks
-        expired = [
-            uid for uid, lock_time in cls._locks.items()
-            if now - lock_time > cls._lock_timeout
-        ]
-        for uid in expired:
-            del cls._locks[uid]
+        client = cls._client()
+        if client is not None:
+            acquired = await client.set(
+                cls.KEY_PREFIX + utxo_id, token, nx=True, px=cls.LOCK_TTL_MS
+            )
+            return token if acquired else None
         
-        # Try to acquire
-        if utxo_id in cls._locks:
-            return False
+        now = time.monotonic_ns()
+        cls._sweep_expired(now)
+        
+        # Anything still present after the sweep is an unexpired lease;
+        # setdefault tests and claims the slot in a single dict probe
+        expiry = now + cls.LOCK_TTL_MS * 1_000_000
+        lease = (token, expiry)
+        if cls._local_locks.setdefault(utxo_id, lease) is not lease:
+            return None
+        heapq.heappush(cls._local_expiries, (expiry, utxo_id))
+        return token
+    
+    @classmethod
+    def _sweep_expired(cls, now: int) -> None:
+        """
+        Drop in-process leases that expired without being released.
         
-        cls._locks[utxo_id] = now
-        return True
+        Pops only the heap entries that are due, so the cost is proportional
+        to the number of expired leases rather than to all held locks.
+        Entries for leases that were released or re-acquired since are
+        skipped.
+        """
+        expiries = cls._local_expiries
+        while expiries and expiries[0][0] <= now:
+            expiry, utxo_id = heapq.heappop(expiries)
+            held = cls._local_locks.get(utxo_id)
+            if held is not None and held[1] == expiry:
+                del cls._local_locks[utxo_id]
     
     @classmethod
-    def release(cls, utxo_id: str) -> None:
-        """Release lock on UTXO."""
-        cls._locks.pop(utxo_id, None)
+    async def release(cls, utxo_id: str, token: str) -> None:
+        """
+        Release lock on UTXO if it is still held with the given token.
+        
+        Args:
+            utxo_id: UTXO identifier
+            token: Token returned by acquire()
+        """
+        client = cls._client()
+        if client is not None:
+            await client.eval(cls._RELEASE_SCRIPT, 1, cls.KEY_PREFIX + utxo_id, token)
+            return
+        
+        held = cls._local_locks.get(utxo_id)
+        if held is not None and held[0] == token:
+            del cls._local_locks[utxo_id]
+    
+    @classmethod
+    async def acquire_many(cls, *utxo_ids: str) -> Optional[dict[str, str]]:
+        """
+        Acquire locks on several UTXOs concurrently, all or nothing.
+        
+        Args:
+            *utxo_ids: UTXO identifiers (duplicates are locked once)
+            
+        Returns:
+            Mapping of UTXO ID to lock token if every lock was acquired,
+            None otherwise (any locks that were taken are released)
+        """
+        unique_ids = list(dict.fromkeys(utxo_ids))
+        tokens = await asyncio.gather(*(cls.acquire(utxo_id) for utxo_id in unique_ids))
+        held = {
+            utxo_id: token
+            for utxo_id, token in zip(unique_ids, tokens)
+            if token is not None
+        }
+        
+        if len(held) < len(unique_ids):
+            await cls.release_many(held)
+            return None
+        return held
+    
+    @classmethod
+    async def release_many(cls, held: dict[str, str]) -> None:
+        """
+        Release locks returned by acquire_many() concurrently.
+        
+        Args:
+            held: Mapping of UTXO ID to lock token
+        """
+        await asyncio.gather(
+            *(cls.release(utxo_id, token) for utxo_id, token in held.items())
+        )
+    
+    @classmethod
+    async def close(cls) -> None:
+        """Close the Redis connection pool, if one was opened."""
+        if cls._redis is not None:
+            await cls._redis.aclose()
+            cls._redis = None
 
 
 class CoordinatorService:
@@ -89,7 +238,8 @@ class CoordinatorService:
             liquid_client: Elements RPC client (optional for testing)
         """
         self.session = session
-        self.liquid_client = liquid_client or LiquidClient()
+        # Shared by default so every coordinator uses one connection pool
+        self.liquid_client = liquid_client or shared_liquid_client
     
     async def assemble_supply_transaction(
         self,
@@ -118,20 +268,23 @@ class CoordinatorService:
         Returns:
             Transaction ID if successful, None if failed
         """
-        utxo_id = reserve.utxo_id if reserve.utxo_id else f"reserve_{reserve.asset_id}"
+        utxo_id = reserve_lock_key(reserve.asset_id)
+        lock_token: Optional[str] = None
         
         try:
             # Try to acquire lock
-            if not UTXOLock.acquire(utxo_id):
-                logger.warning(f"UTXO {utxo_id} is locked, retrying...")
+            lock_token = await UTXOLock.acquire(utxo_id)
+            if lock_token is None:
+                logger.warning("UTXO {} is locked, retrying...", utxo_id)
                 await asyncio.sleep(0.5)
                 
                 # Retry once
-                if not UTXOLock.acquire(utxo_id):
+                lock_token = await UTXOLock.acquire(utxo_id)
+                if lock_token is None:
                     logger.error(f"Failed to acquire lock on UTXO {utxo_id}")
                     return None
             
-            logger.info(f"Assembling supply transaction for {user_address}")
+            logger.info("Assembling supply transaction for {}", user_address)
             
             # TODO: Implement actual UTXO transaction assembly
             # This is a placeholder for MVP
@@ -143,18 +296,17 @@ class CoordinatorService:
             # 5. Broadcast to network
             
             # For MVP, we simulate transaction broadcast
-            tx_id = await self._simulate_transaction_broadcast(
-                user_address=user_address,
-                asset_id=reserve.asset_id,
-                amount=amount,
+            tx_id = await self._simulate_broadcast(
+                "supply", user_address, reserve.asset_id, amount
             )
             
             if tx_id:
-                logger.info(f"Supply transaction broadcast: {tx_id}")
+                logger.info("Supply transaction broadcast: {}", tx_id)
                 
                 # Update reserve UTXO ID
                 reserve.utxo_id = f"utxo_{tx_id}_0"
                 await self.session.commit()
+                invalidate_reserve_cache(reserve.asset_id)
             
             return tx_id
         
@@ -163,41 +315,30 @@ class CoordinatorService:
             return None
         
         finally:
-            # Always release lock
-            UTXOLock.release(utxo_id)
+            # Release the lock only if this call actually holds it
+            if lock_token is not None:
+                await UTXOLock.release(utxo_id, lock_token)
     
-    async def _simulate_transaction_broadcast(
-        self,
-        user_address: str,
-        asset_id: str,
-        amount: int,
-    ) -> Optional[str]:
+    async def _simulate_broadcast(self, operation: str, *parts: object) -> str:
         """
         Simulate transaction broadcast for MVP.
         
         In production, this would call Elements RPC to broadcast real transaction.
         
         Args:
-            user_address: User's address
-            asset_id: Asset being supplied
-            amount: Amount being supplied
+            operation: Operation name (supply, withdraw, borrow, liquidate)
+            *parts: Operation fields hashed into the transaction ID
             
         Returns:
             Simulated transaction ID
         """
-        # Generate fake transaction ID for MVP
-        import hashlib
+        tx_id = _simulated_tx_id(operation, *parts)
         
-        tx_data = f"{user_address}:{asset_id}:{amount}:{datetime.utcnow().isoformat()}"
-        tx_id = hashlib.sha256(tx_data.encode()).hexdigest()
+        logger.info("[SIMULATED] Broadcasting {} transaction: {:.16}...", operation, tx_id)
         
-        logger.info(
-            f"[SIMULATED] Broadcasting supply transaction: "
-            f"user={user_address[:10]}..., asset={asset_id[:8]}..., amount={amount}"
-        )
-        
-        # Simulate network delay
-        await asyncio.sleep(0.1)
+        # Optional artificial network delay (off by default)
+        if delay := settings.SIMULATE_NETWORK_DELAY:
+            await asyncio.sleep(delay)
         
         return tx_id
     
@@ -214,7 +355,7 @@ class CoordinatorService:
         try:
             # TODO: Implement actual transaction verification
             # For MVP, assume all transactions are confirmed
-            logger.info(f"[SIMULATED] Verifying transaction {tx_id}")
+            logger.info("[SIMULATED] Verifying transaction {}", tx_id)
             return True
         
         except Exception as e:
@@ -232,43 +373,22 @@ class CoordinatorService:
         """
         try:
             logger.info(
-                f"Assembling withdraw transaction: user={user_address[:10]}..., asset={asset_id[:8]}..., amount={amount}"
+                "Assembling withdraw transaction: user={:.10}..., asset={:.8}..., amount={}",
+                user_address, asset_id, amount,
             )
 
-            tx_id = await self._simulate_withdraw_broadcast(
-                user_address=user_address,
-                asset_id=asset_id,
-                amount=amount,
+            tx_id = await self._simulate_broadcast(
+                "withdraw", user_address, asset_id, amount
             )
 
             if tx_id:
-                logger.info(f"Withdraw transaction broadcast: {tx_id}")
+                logger.info("Withdraw transaction broadcast: {}", tx_id)
             return tx_id
 
         except Exception as e:
             logger.error(f"Error assembling withdraw transaction: {e}", exc_info=True)
             return None
 
-    async def _simulate_withdraw_broadcast(
-        self,
-        user_address: str,
-        asset_id: str,
-        amount: int,
-    ) -> Optional[str]:
-        """Simulate withdraw transaction broadcast."""
-        import hashlib
-
-        tx_data = f"{user_address}:{asset_id}:withdraw:{amount}:{datetime.utcnow().isoformat()}"
-        tx_id = hashlib.sha256(tx_data.encode()).hexdigest()
-
-        logger.info(
-            f"[SIMULATED] Broadcasting withdraw transaction: "
-            f"user={user_address[:10]}..., asset={asset_id[:8]}..., amount={amount}"
-        )
-
-        await asyncio.sleep(0.1)
-        return tx_id
-    
     async def get_utxo_state(self, utxo_id: str) -> Optional[dict]:
         """
         Fetch UTXO state from Elements node.
@@ -282,7 +402,7 @@ class CoordinatorService:
         try:
             # TODO: Implement actual UTXO fetching from Elements node
             # For MVP, return None (not implemented)
-            logger.warning(f"[SIMULATED] Fetching UTXO {utxo_id} - not implemented")
+            logger.warning("[SIMULATED] Fetching UTXO {} - not implemented", utxo_id)
             return None
         
         except Exception as e:
@@ -301,10 +421,11 @@ class CoordinatorService:
         Assemble and broadcast borrow transaction.
         
         Process:
-        1. Lock collateral
+        1. Lock collateral and borrow reserve UTXOs
         2. Create debt UTXO
         3. Transfer borrowed assets to user
         4. Sign and broadcast
+        5. Release locks
         
         Args:
             user_address: User's address
@@ -316,63 +437,47 @@ class CoordinatorService:
         Returns:
             Transaction ID if successful, None if failed
         """
+        held_locks: Optional[dict[str, str]] = None
+        
         try:
+            # Both reserves are spent by the same transaction; lock them
+            # concurrently, and give up (holding neither) if either is busy
+            held_locks = await UTXOLock.acquire_many(
+                reserve_lock_key(collateral_asset_id), reserve_lock_key(borrow_asset_id)
+            )
+            if held_locks is None:
+                logger.error(
+                    f"Failed to lock reserves {collateral_asset_id[:8]}.../"
+                    f"{borrow_asset_id[:8]}... for borrow"
+                )
+                return None
+            
             logger.info(
-                f"Assembling borrow transaction: "
-                f"user={user_address[:10]}..., "
-                f"collateral={collateral_amount} {collateral_asset_id[:8]}..., "
-                f"borrow={borrow_amount} {borrow_asset_id[:8]}..."
+                "Assembling borrow transaction: "
+                "user={:.10}..., collateral={} {:.8}..., borrow={} {:.8}...",
+                user_address, collateral_amount, collateral_asset_id,
+                borrow_amount, borrow_asset_id,
             )
             
             # TODO: Implement actual UTXO transaction assembly
             # For MVP, simulate transaction
-            tx_id = await self._simulate_borrow_broadcast(
-                user_address=user_address,
-                collateral_amount=collateral_amount,
-                borrow_amount=borrow_amount,
+            tx_id = await self._simulate_broadcast(
+                "borrow", user_address, collateral_amount, borrow_amount
             )
             
             if tx_id:
-                logger.info(f"Borrow transaction broadcast: {tx_id}")
+                logger.info("Borrow transaction broadcast: {}", tx_id)
             
             return tx_id
         
         except Exception as e:
             logger.error(f"Error assembling borrow transaction: {e}", exc_info=True)
             return None
-    
-    async def _simulate_borrow_broadcast(
-        self,
-        user_address: str,
-        collateral_amount: int,
-        borrow_amount: int,
-    ) -> Optional[str]:
-        """
-        Simulate borrow transaction broadcast for MVP.
-        
-        Args:
-            user_address: User's address
-            collateral_amount: Collateral amount
-            borrow_amount: Borrow amount
-            
-        Returns:
-            Simulated transaction ID
-        """
-        import hashlib
         
-        tx_data = f"{user_address}:borrow:{collateral_amount}:{borrow_amount}:{datetime.utcnow().isoformat()}"
-        tx_id = hashlib.sha256(tx_data.encode()).hexdigest()
-        
-        logger.info(
-            f"[SIMULATED] Broadcasting borrow transaction: "
-            f"user={user_address[:10]}..., collateral={collateral_amount}, borrow={borrow_amount}"
-        )
-        
-        # Simulate network delay
-        await asyncio.sleep(0.1)
-        
-        return tx_id
-
+        finally:
+            if held_locks:
+                await UTXOLock.release_many(held_locks)
+    
     async def assemble_liquidation_transaction(
         self,
         liquidator_address: str,
@@ -384,47 +489,23 @@ class CoordinatorService:
         try:
             logger.info(
                 "Assembling liquidation transaction: "
-                f"liquidator={liquidator_address[:10]}..., "
-                f"repay={repay_amount}, collateral={collateral_seized}"
+                "liquidator={:.10}..., repay={}, collateral={}",
+                liquidator_address, repay_amount, collateral_seized,
             )
 
-            tx_id = await self._simulate_liquidation_broadcast(
-                liquidator_address=liquidator_address,
-                repay_amount=repay_amount,
-                collateral_seized=collateral_seized,
-                position_id=position.id if position else None,
+            tx_id = await self._simulate_broadcast(
+                "liquidate",
+                liquidator_address,
+                repay_amount,
+                collateral_seized,
+                position.id if position else None,
             )
 
             if tx_id:
-                logger.info(f"Liquidation transaction broadcast: {tx_id}")
+                logger.info("Liquidation transaction broadcast: {}", tx_id)
 
             return tx_id
 
         except Exception as e:
             logger.error(f"Error assembling liquidation transaction: {e}", exc_info=True)
             return None
-
-    async def _simulate_liquidation_broadcast(
-        self,
-        liquidator_address: str,
-        repay_amount: int,
-        collateral_seized: int,
-        position_id: int | None,
-    ) -> Optional[str]:
-        """Simulate liquidation transaction broadcast."""
-        import hashlib
-
-        tx_data = (
-            f"{liquidator_address}:liquidate:{repay_amount}:{collateral_seized}:"
-            f"{position_id}:{datetime.utcnow().isoformat()}"
-        )
-        tx_id = hashlib.sha256(tx_data.encode()).hexdigest()
-
-        logger.info(
-            f"[SIMULATED] Broadcasting liquidation transaction: "
-            f"liquidator={liquidator_address[:10]}..., repay={repay_amount}, "
-            f"collateral={collateral_seized}"
-        )
-
-        await asyncio.sleep(0.1)
-        return tx_id
@@ -4,10 +4,12 @@ Debt Service for Borrow Operations
 Handles borrowing, repayment, and health factor calculations.
 """
 
-from typing import List, Optional
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.debt_position import DebtPosition
@@ -17,6 +19,17 @@ from ..utils.ray_math import RAY, ray_mul, ray_div
 from .interest_calculator import InterestCalculator
 from .oracle_service import OracleService
 from .coordinator import CoordinatorService
+from .reserve_cache import invalidate_reserve_cache
+
+
+# Hot lookups, built once so every call reuses the same cached compiled form
+_SELECT_USER_BY_ADDRESS = select(User).where(User.address == bindparam("address"))
+_SELECT_RESERVE_BY_ASSET = select(ReserveState).where(
+    ReserveState.asset_id == bindparam("asset_id")
+)
+_SELECT_POSITION_BY_ID = select(DebtPosition).where(
+    DebtPosition.id == bindparam("position_id")
+)
 
 
 class DebtService:
@@ -30,10 +43,14 @@ class DebtService:
     - Collateral management
     """
     
-    # Protocol parameters (from AAVE)
-    LTV_BTC = int(0.75 * RAY)  # 75% Loan-to-Value for BTC
-    LIQUIDATION_THRESHOLD_BTC = int(0.80 * RAY)  # 80% liquidation threshold
-    LIQUIDATION_BONUS = int(0.05 * RAY)  # 5% liquidation bonus
+    # Protocol parameters (from AAVE), exact in RAY
+    LTV_BTC = RAY * 75 // 100  # 75% Loan-to-Value for BTC
+    LIQUIDATION_THRESHOLD_BTC = RAY * 80 // 100  # 80% liquidation threshold
+    LIQUIDATION_BONUS = RAY * 5 // 100  # 5% liquidation bonus
+    LIQUIDATION_BONUS_FACTOR = RAY + LIQUIDATION_BONUS  # seized per repaid, in RAY
+    
+    # Rows fetched per round trip when scanning for liquidatable positions
+    LIQUIDATION_SCAN_BATCH_SIZE = 500
     
     def __init__(self, session: AsyncSession):
         """
@@ -54,7 +71,7 @@ class DebtService:
         collateral_amount: int,
         borrow_asset_id: str,
         borrow_amount: int,
-    ) -> DebtPosition:
+    ) -> Tuple[DebtPosition, Optional[int]]:
         """
         Create a borrow position.
         
@@ -76,7 +93,7 @@ class DebtService:
             borrow_amount: Amount to borrow (satoshis)
         
         Returns:
-            Created debt position
+            Tuple (created debt position, user's health factor after borrowing)
         
         Raises:
             ValueError: If validation fails
@@ -120,7 +137,7 @@ class DebtService:
         
         # Get borrow reserve
         result = await self.session.execute(
-            select(ReserveState).where(ReserveState.asset_id == borrow_asset_id)
+            _SELECT_RESERVE_BY_ASSET, {"asset_id": borrow_asset_id}
         )
         reserve = result.scalar_one_or_none()
         
@@ -163,10 +180,11 @@ class DebtService:
             f"borrow={borrow_amount} {borrow_asset_id[:8]}..."
         )
         
+        # Server defaults come back from INSERT ... RETURNING, so no refresh
         await self.session.commit()
-        await self.session.refresh(position)
+        invalidate_reserve_cache(borrow_asset_id)
         
-        return position
+        return position, user.health_factor
     
     async def calculate_health_factor(
         self,
@@ -189,83 +207,107 @@ class DebtService:
         """
         # Get user
         result = await self.session.execute(
-            select(User).where(User.address == user_address)
+            _SELECT_USER_BY_ADDRESS, {"address": user_address}
         )
         user = result.scalar_one_or_none()
         
         if not user:
             return None
         
-        # Get all debt positions
+        total_collateral_value, total_debt_value, _ = await self._snapshot_user(user.id)
+        health_factor = self._health_factor(total_collateral_value, total_debt_value)
+        
+        if health_factor is not None:
+            logger.opt(lazy=True).debug(
+                "Health factor for {}: {:.4f} (collateral=${:,.2f}, debt=${:,.2f})",
+                lambda: user_address,
+                lambda: health_factor / RAY,
+                lambda: total_collateral_value / RAY,
+                lambda: total_debt_value / RAY,
+            )
+        
+        return health_factor
+    
+    async def _snapshot_user(
+        self,
+        user_id: int
+    ) -> Tuple[int, int, Dict[str, Optional[int]]]:
+        """
+        Value all of a user's debt positions at current indices and prices.
+        
+        Args:
+            user_id: User's database ID
+        
+        Returns:
+            Tuple of (total_collateral_value, total_debt_value, prices), the
+            values in USD (RAY precision) and prices keyed by asset ID
+        """
+        # Get all debt positions (only the columns the valuation needs)
         result = await self.session.execute(
-            select(DebtPosition).where(DebtPosition.user_id == user.id)
+            select(
+                DebtPosition.borrowed_asset_id,
+                DebtPosition.collateral_asset_id,
+                DebtPosition.principal,
+                DebtPosition.borrow_index_at_open,
+                DebtPosition.collateral_amount,
+            ).where(DebtPosition.user_id == user_id)
         )
-        debt_positions = result.scalars().all()
+        debt_positions = result.all()
         
         if not debt_positions:
-            return None  # No debt, infinite health factor
+            return 0, 0, {}
+        
+        # Resolve each referenced reserve and price once, not per position
+        borrowed_asset_ids = {p.borrowed_asset_id for p in debt_positions}
+        borrow_indices = await self._get_borrow_indices(borrowed_asset_ids)
+        prices = await self._get_fresh_prices(
+            borrowed_asset_ids | {p.collateral_asset_id for p in debt_positions}
+        )
         
         # Calculate total collateral value
         total_collateral_value = 0
         
         for position in debt_positions:
-            collateral_value = await self.oracle.get_asset_value(
-                position.collateral_amount,
-                position.collateral_asset_id
-            )
-            
-            if collateral_value:
-                total_collateral_value += collateral_value
+            collateral_price = prices[position.collateral_asset_id]
+            if collateral_price:
+                total_collateral_value += self.oracle.calculate_value(
+                    position.collateral_amount,
+                    position.collateral_asset_id,
+                    collateral_price,
+                )
         
         # Calculate total debt value
         total_debt_value = 0
         
         for position in debt_positions:
-            # Get current borrow index
-            result = await self.session.execute(
-                select(ReserveState).where(
-                    ReserveState.asset_id == position.borrowed_asset_id
-                )
-            )
-            reserve = result.scalar_one_or_none()
+            borrow_index = borrow_indices.get(position.borrowed_asset_id)
+            debt_price = prices[position.borrowed_asset_id]
+            if borrow_index is None or not debt_price:
+                continue
             
-            if reserve:
-                # Update index
-                reserve = await self._update_borrow_index(reserve)
-                
-                # Calculate current debt
-                current_debt = position.calculate_current_debt(
-                    reserve.variable_borrow_index
-                )
-                
-                # Get debt value in USD
-                debt_value = await self.oracle.get_asset_value(
-                    current_debt,
-                    position.borrowed_asset_id
-                )
-                
-                if debt_value:
-                    total_debt_value += debt_value
+            current_debt = DebtPosition.scale_debt(
+                position.principal, borrow_index, position.borrow_index_at_open
+            )
+            total_debt_value += self.oracle.calculate_value(
+                current_debt, position.borrowed_asset_id, debt_price
+            )
+        
+        return total_collateral_value, total_debt_value, prices
+    
+    def _health_factor(self, collateral_value: int, debt_value: int) -> Optional[int]:
+        """
+        Health factor for the given USD values, None if there is no debt.
         
-        if total_debt_value == 0:
+        health_factor = (collateral * threshold) / debt
+        """
+        if debt_value == 0:
             return None  # No debt
         
-        # Calculate health factor
-        # health_factor = (collateral * threshold) / debt
         weighted_collateral = ray_mul(
-            total_collateral_value,
+            collateral_value,
             self.LIQUIDATION_THRESHOLD_BTC
         )
-        
-        health_factor = ray_div(weighted_collateral, total_debt_value)
-        
-        logger.debug(
-            f"Health factor for {user_address}: {health_factor/RAY:.4f} "
-            f"(collateral=${total_collateral_value/RAY:,.2f}, "
-            f"debt=${total_debt_value/RAY:,.2f})"
-        )
-        
-        return health_factor
+        return ray_div(weighted_collateral, debt_value)
     
     async def _update_borrow_index(self, reserve: ReserveState) -> ReserveState:
         """
@@ -277,27 +319,64 @@ class DebtService:
         Returns:
             Updated reserve state
         """
-        # Calculate time elapsed
-        now = int(datetime.utcnow().timestamp())
-        time_delta = now - reserve.last_update_timestamp
-        
-        if time_delta > 0:
-            # Accrue interest on borrow index
-            new_index = self.interest_calculator.accrue_index(
-                current_index=reserve.variable_borrow_index,
-                rate_per_second=reserve.variable_borrow_rate,
-                time_delta=time_delta
+        # Accrue both indices together: advancing last_update_timestamp after
+        # touching only the borrow side would silently drop supplier interest.
+        # Once accrued, the timestamp equals now, so repeat calls for the same
+        # reserve within a request (same identity-map object) are no-ops.
+        now = int(time.time())
+        
+        if now > reserve.last_update_timestamp:
+            (
+                reserve.liquidity_index,
+                reserve.variable_borrow_index,
+            ) = self.interest_calculator.accrue_indices(
+                current_liquidity_index=reserve.liquidity_index,
+                current_borrow_index=reserve.variable_borrow_index,
+                liquidity_rate=reserve.current_liquidity_rate,
+                borrow_rate=reserve.current_variable_borrow_rate,
+                last_update_timestamp=reserve.last_update_timestamp,
             )
-            
-            reserve.variable_borrow_index = new_index
             reserve.last_update_timestamp = now
         
         return reserve
 
+    async def _get_borrow_indices(
+        self,
+        asset_ids: Optional[Set[str]] = None
+    ) -> Dict[str, int]:
+        """
+        Fetch and accrue the borrow index of several reserves in one query.
+        
+        Args:
+            asset_ids: Borrowed asset identifiers (None for every reserve)
+        
+        Returns:
+            Mapping of asset ID to current variableBorrowIndex (assets
+            without a reserve are omitted)
+        """
+        query = select(ReserveState)
+        if asset_ids is not None:
+            query = query.where(ReserveState.asset_id.in_(asset_ids))
+        result = await self.session.execute(query)
+        
+        borrow_indices = {}
+        for reserve in result.scalars():
+            reserve = await self._update_borrow_index(reserve)
+            borrow_indices[reserve.asset_id] = reserve.variable_borrow_index
+        return borrow_indices
+    
+    async def _get_fresh_prices(self, asset_ids: Set[str]) -> Dict[str, Optional[int]]:
+        """Fetch fresh oracle prices for several assets concurrently."""
+        asset_ids = list(asset_ids)
+        prices = await asyncio.gather(
+            *(self._get_fresh_price(asset_id) for asset_id in asset_ids)
+        )
+        return dict(zip(asset_ids, prices))
+    
     async def _get_reserve_state(self, asset_id: str) -> Optional[ReserveState]:
         """Fetch reserve state for asset."""
         result = await self.session.execute(
-            select(ReserveState).where(ReserveState.asset_id == asset_id)
+            _SELECT_RESERVE_BY_ASSET, {"asset_id": asset_id}
         )
         return result.scalar_one_or_none()
 
@@ -344,7 +423,7 @@ class DebtService:
         )
         
         result = await self.session.execute(
-            select(DebtPosition).where(DebtPosition.id == position_id)
+            _SELECT_POSITION_BY_ID, {"position_id": position_id}
         )
         position = result.scalar_one_or_none()
 
@@ -369,7 +448,23 @@ class DebtService:
             logger.warning(f"Liquidation failed: Position {position_id} has no outstanding debt")
             raise ValueError("Position has no outstanding debt")
 
-        health_factor = await self.get_position_health_factor(position)
+        # One user-wide valuation up front; the post-liquidation health
+        # factor is derived from it instead of re-running the sweep
+        total_collateral_value, total_debt_value, prices = await self._snapshot_user(user.id)
+        debt_price = prices.get(position.borrowed_asset_id)
+        collateral_price = prices.get(position.collateral_asset_id)
+        
+        health_factor = None
+        if debt_price and collateral_price:
+            debt_value = self.oracle.calculate_value(
+                current_debt, position.borrowed_asset_id, debt_price
+            )
+            collateral_value = self.oracle.calculate_value(
+                position.collateral_amount, position.collateral_asset_id, collateral_price
+            )
+            if debt_value and collateral_value:
+                health_factor = self._health_factor(collateral_value, debt_value)
+        
         if health_factor is None:
             logger.warning(f"Liquidation failed: Unable to determine health factor for position {position_id}")
             raise ValueError("Unable to determine health factor")
@@ -393,12 +488,12 @@ class DebtService:
         if repay_amount <= 0:
             raise ValueError("Repay amount must be positive")
 
-        # Calculate proportional collateral to seize (with bonus)
-        collateral_base = (position.collateral_amount * repay_amount) // current_debt
-        bonus_collateral = (collateral_base * self.LIQUIDATION_BONUS) // RAY
+        # Calculate proportional collateral to seize (with bonus), truncated
+        # once; a full repay always reaches the cap of the whole collateral
         collateral_to_seize = min(
             position.collateral_amount,
-            collateral_base + bonus_collateral
+            (position.collateral_amount * repay_amount * self.LIQUIDATION_BONUS_FACTOR)
+            // (current_debt * RAY)
         )
 
         remaining_debt = current_debt - repay_amount
@@ -406,8 +501,7 @@ class DebtService:
 
         logger.info(
             f"Liquidation details: repay={repay_amount}, "
-            f"collateral_seized={collateral_to_seize} "
-            f"(base={collateral_base}, bonus={bonus_collateral}), "
+            f"collateral_seized={collateral_to_seize}, "
             f"type={'FULL' if is_full_liquidation else 'PARTIAL'}"
         )
 
@@ -416,7 +510,6 @@ class DebtService:
         reserve.total_liquidity += repay_amount
 
         if is_full_liquidation:
-            collateral_to_seize = position.collateral_amount
             logger.info(f"Full liquidation: closing position {position_id}")
             await self.session.delete(position)
         else:
@@ -428,14 +521,21 @@ class DebtService:
                 f"Partial liquidation: position {position_id} remaining - "
                 f"debt={remaining_debt}, collateral={position.collateral_amount}"
             )
-            await self.session.flush()
 
-        await self._update_user_health_factor(user)
-        await self.session.flush()
+        # Swap this position's pre-liquidation values for what is left of it
+        remaining_collateral = 0 if is_full_liquidation else position.collateral_amount
+        user.health_factor = self._health_factor(
+            total_collateral_value - collateral_value + self.oracle.calculate_value(
+                remaining_collateral, position.collateral_asset_id, collateral_price
+            ),
+            total_debt_value - debt_value + self.oracle.calculate_value(
+                max(remaining_debt, 0), position.borrowed_asset_id, debt_price
+            ),
+        )
+        # Sessions keep attributes after commit (expire_on_commit=False) and
+        # the coordinator only needs position.id, so no refresh SELECT
         await self.session.commit()
-
-        if not is_full_liquidation:
-            await self.session.refresh(position)
+        invalidate_reserve_cache(reserve.asset_id)
 
         # Assemble liquidation transaction (simulated for MVP)
         tx_id = await self.coordinator.assemble_liquidation_transaction(
@@ -445,13 +545,14 @@ class DebtService:
             collateral_seized=collateral_to_seize,
         )
 
-        new_health_factor = await self.calculate_health_factor(user.address)
+        # Health factor was recomputed from the post-liquidation state above
+        new_health_factor = user.health_factor
 
         logger.info(
             f"Liquidation completed: position_id={position_id}, "
             f"liquidator={liquidator_address[:10]}..., "
             f"repaid={repay_amount}, seized={collateral_to_seize}, "
-            f"new_hf={new_health_factor/RAY if new_health_factor else 'N/A':.4f}, "
+            f"new_hf={f'{new_health_factor/RAY:.4f}' if new_health_factor else 'N/A'}, "
             f"tx_id={tx_id[:16] if tx_id else 'None'}..."
         )
 
@@ -464,29 +565,80 @@ class DebtService:
             "tx_id": tx_id,
         }
 
-    async def get_liquidatable_positions(self) -> List[dict]:
+    async def get_liquidatable_positions(
+        self,
+        price_overrides: Optional[Dict[str, int]] = None
+    ) -> List[dict]:
         """Return list of liquidatable positions with health factor."""
-        result = await self.session.execute(select(DebtPosition))
-        positions = result.scalars().all()
-        liquidatable: List[dict] = []
+        return [
+            position
+            async for position in self.stream_liquidatable_positions(price_overrides)
+        ]
+
+    async def stream_liquidatable_positions(
+        self,
+        price_overrides: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Yield liquidatable positions with health factor.
+
+        Only the columns needed for the health check (plus the owner's
+        address) are read, through a streaming cursor in batches of
+        LIQUIDATION_SCAN_BATCH_SIZE so the full table is never held in
+        memory. Borrow indices (all reserves, one query) and prices are
+        resolved once per asset rather than once per position.
+
+        Args:
+            price_overrides: Prices (RAY) to evaluate instead of the
+                oracle's, keyed by asset ID, e.g. to see which positions a
+                pending price update would make liquidatable. Assets not
+                listed are still priced by the oracle.
+        """
+        # One row per asset, so load them all up front instead of a
+        # SELECT per newly seen asset in the middle of the cursor
+        borrow_indices = await self._get_borrow_indices()
+
+        result = await self.session.stream(
+            select(
+                DebtPosition.id,
+                DebtPosition.borrowed_asset_id,
+                DebtPosition.collateral_asset_id,
+                DebtPosition.principal,
+                DebtPosition.borrow_index_at_open,
+                DebtPosition.collateral_amount,
+                User.address,
+            )
+            .join(User, DebtPosition.user_id == User.id)
+            .execution_options(yield_per=self.LIQUIDATION_SCAN_BATCH_SIZE)
+        )
 
-        for position in positions:
-            reserve = await self._get_reserve_state(position.borrowed_asset_id)
-            if not reserve:
+        prices: Dict[str, Optional[int]] = dict(price_overrides or {})
+
+        async for row in result:
+            borrow_index = borrow_indices.get(row.borrowed_asset_id)
+            if borrow_index is None:
                 continue
 
-            reserve = await self._update_borrow_index(reserve)
-            current_debt = position.calculate_current_debt(reserve.variable_borrow_index)
+            current_debt = DebtPosition.scale_debt(
+                row.principal, borrow_index, row.borrow_index_at_open
+            )
             if current_debt <= 0:
                 continue
 
-            debt_value = await self.oracle.get_asset_value(
-                current_debt,
-                position.borrowed_asset_id
+            for asset_id in (row.borrowed_asset_id, row.collateral_asset_id):
+                if asset_id not in prices:
+                    prices[asset_id] = await self._get_fresh_price(asset_id)
+            debt_price = prices[row.borrowed_asset_id]
+            collateral_price = prices[row.collateral_asset_id]
+
+            if not debt_price or not collateral_price:
+                continue
+
+            debt_value = self.oracle.calculate_value(
+                current_debt, row.borrowed_asset_id, debt_price
             )
-            collateral_value = await self.oracle.get_asset_value(
-                position.collateral_amount,
-                position.collateral_asset_id
+            collateral_value = self.oracle.calculate_value(
+                row.collateral_amount, row.collateral_asset_id, collateral_price
             )
 
             if not debt_value or not collateral_value:
@@ -496,21 +648,25 @@ class DebtService:
                 collateral_value,
                 self.LIQUIDATION_THRESHOLD_BTC
             )
-            health_factor = ray_div(weighted_collateral, debt_value)
-
-            if health_factor < RAY:
-                user = await self.session.get(User, position.user_id)
-                liquidatable.append({
-                    "position_id": position.id,
-                    "user_address": user.address if user else "",
-                    "borrowed_asset_id": position.borrowed_asset_id,
-                    "collateral_asset_id": position.collateral_asset_id,
+            # Same test as ray_div(w, d) < RAY with the division cancelled
+            # out, so healthy positions never pay for it
+            if (debt_value - weighted_collateral) * RAY > debt_value // 2:
+                yield {
+                    "position_id": row.id,
+                    "user_address": row.address,
+                    "borrowed_asset_id": row.borrowed_asset_id,
+                    "collateral_asset_id": row.collateral_asset_id,
                     "current_debt": current_debt,
-                    "collateral_amount": position.collateral_amount,
-                    "health_factor": health_factor,
-                })
-
-        return liquidatable
+                    "collateral_amount": row.collateral_amount,
+                    "health_factor": ray_div(weighted_collateral, debt_value),
+                }
+
+    async def _get_fresh_price(self, asset_id: str) -> Optional[int]:
+        """Return the asset's oracle price, or None if unavailable or stale."""
+        price_feed = await self.oracle.get_price(
+            asset_id, max_age=self.oracle.MAX_PRICE_AGE
+        )
+        return price_feed.price if price_feed else None
 
     
     async def _update_user_health_factor(self, user: User) -> None:
@@ -534,7 +690,7 @@ class DebtService:
             User entity
         """
         result = await self.session.execute(
-            select(User).where(User.address == address)
+            _SELECT_USER_BY_ADDRESS, {"address": address}
         )
         user = result.scalar_one_or_none()
         
@@ -545,6 +701,3 @@ class DebtService:
         
         return user
 
-
-# Import datetime at module level
-from datetime import datetime
@@ -7,7 +7,7 @@ Handles RAY-based interest accrual and index updates.
 import time
 from typing import Tuple
 
-from ..utils.ray_math import RAY, accrue_index, ray_div, ray_mul
+from ..utils.ray_math import RAY, accrue_index, ray_div
 
 
 class InterestCalculator:
@@ -79,14 +79,9 @@ class InterestCalculator:
         Returns:
             aToken amount (satoshis)
         """
-        # Convert underlying to RAY precision
-        underlying_ray = underlying_amount * RAY
-        
-        # Divide by index to get aToken amount
-        atoken_amount = ray_div(underlying_ray, liquidity_index)
-        
-        # Convert back to satoshis
-        return atoken_amount // RAY
+        # Same result as ray_div(underlying * RAY, index) // RAY: the rounding
+        # term shrinks by RAY instead of the numerator growing by it
+        return (underlying_amount * RAY + liquidity_index // 2 // RAY) // liquidity_index
     
     @staticmethod
     def calculate_underlying_amount(
@@ -105,14 +100,8 @@ class InterestCalculator:
         Returns:
             Underlying asset amount (satoshis)
         """
-        # Convert aToken to RAY precision
-        atoken_ray = atoken_amount * RAY
-        
-        # Multiply by index to get underlying
-        underlying_amount = ray_mul(atoken_ray, liquidity_index)
-        
-        # Convert back to satoshis
-        return underlying_amount // RAY
+        # ray_mul(atoken * RAY, index) // RAY with the RAY factors cancelled
+        return (atoken_amount * liquidity_index) // RAY
     
     @staticmethod
     def calculate_accrued_interest(
@@ -139,9 +128,9 @@ class InterestCalculator:
         # Calculate growth factor
         growth_factor = ray_div(current_index, initial_index)
         
-        # Calculate new amount
-        principal_ray = principal * RAY
-        new_amount = ray_mul(principal_ray, growth_factor) // RAY
+        # Calculate new amount (RAY factors of ray_mul(principal * RAY, g)
+        # // RAY cancelled)
+        new_amount = (principal * growth_factor) // RAY
         
         # Interest is the difference
         return new_amount - principal
@@ -7,25 +7,25 @@ Rates are returned as per-second rates in RAY precision (1e27).
 
 from typing import Tuple
 
-from ..utils.ray_math import RAY, ray_div, ray_mul
-
-SECONDS_PER_YEAR = 31536000
+from ..utils.ray_math import RAY, SECONDS_PER_YEAR, ray_div, ray_mul
 
 
 class InterestRateModel:
     """Piecewise-linear interest rate model similar to AAVE v2."""
 
-    # Parameters (annual, RAY precision)
-    BASE_BORROW_RATE = int(0.02 * RAY)  # 2% base per year
-    OPTIMAL_UTILIZATION = int(0.80 * RAY)  # 80%
-    SLOPE1 = int(0.20 * RAY)  # 20% per year until optimal
-    SLOPE2 = int(1.00 * RAY)  # +100% per year above optimal
+    # Parameters (annual, RAY precision). Integer arithmetic keeps them
+    # exact; int(0.8 * RAY) would carry float rounding error into the RAY digits
+    BASE_BORROW_RATE = RAY * 2 // 100  # 2% base per year
+    OPTIMAL_UTILIZATION = RAY * 80 // 100  # 80%
+    SLOPE1 = RAY * 20 // 100  # 20% per year until optimal
+    SLOPE2 = RAY  # +100% per year above optimal
 
     @staticmethod
     def _to_per_second(rate_annual: int) -> int:
         """Convert annual rate (RAY) to per-second rate (RAY)."""
-        # per_second = annual / SECONDS_PER_YEAR
-        return ray_div(rate_annual, SECONDS_PER_YEAR)
+        # SECONDS_PER_YEAR is a plain count, not a RAY value, so this is an
+        # ordinary integer division; ray_div would scale the result by RAY
+        return rate_annual // SECONDS_PER_YEAR
 
     def calculate_borrow_rate_annual(self, utilization: int) -> int:
         """
@@ -5,12 +5,22 @@ Handles fetching and validating asset prices from external oracles.
 For MVP, uses simulated prices. Production would integrate with real oracles.
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Dict, Optional
 
 from loguru import logger
 
-from ..utils.ray_math import RAY
+from ..utils.ray_math import HALF_RAY, RAY
+
+
+# Satoshis per whole unit (8 decimals)
+SATS_PER_UNIT = 100_000_000
+
+# ray_mul(amount, price) // SATS_PER_UNIT folded into one division
+_VALUE_DIVISOR = RAY * SATS_PER_UNIT
 
 
 class PriceFeed:
@@ -20,7 +30,7 @@ class PriceFeed:
     Attributes:
         asset_id: Asset identifier
         price: Price in USD with RAY precision (10^27)
-        timestamp: When price was updated
+        timestamp: When price was updated (Unix seconds)
         signature: Oracle signature (optional for MVP)
     """
     
@@ -28,7 +38,7 @@ class PriceFeed:
         self,
         asset_id: str,
         price: int,
-        timestamp: datetime,
+        timestamp: int,
         signature: Optional[str] = None
     ):
         self.asset_id = asset_id
@@ -46,8 +56,12 @@ class PriceFeed:
         Returns:
             True if stale, False if fresh
         """
-        age = datetime.utcnow() - self.timestamp
-        return age.total_seconds() > max_age_seconds
+        return int(time.time()) - self.timestamp > max_age_seconds
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Update time as an aware UTC datetime."""
+        return datetime.fromtimestamp(self.timestamp, timezone.utc)
 
 
 class OracleService:
@@ -70,40 +84,136 @@ class OracleService:
         "usdt_asset_id_placeholder": 1 * RAY,      # $1
     }
     
+    # Oldest price (seconds) valuations accept
+    MAX_PRICE_AGE = 300
+    
+    # Per-feed cache TTL bounds (seconds). Feeds that keep returning the same
+    # price are cached longer, moving ones shorter; the ceiling stays under
+    # MAX_PRICE_AGE so a cached feed is never served stale
+    MIN_CACHE_TTL = 5
+    MAX_CACHE_TTL = 240
+    
+    # Feeds kept in the cache; the least recently used is evicted beyond this
+    MAX_CACHED_FEEDS = 1024
+    
     def __init__(self):
         """Initialize oracle service."""
-        self._price_cache: Dict[str, PriceFeed] = {}
-        self._cache_ttl = 60  # Cache for 60 seconds
+        # LRU of feeds keyed by canonical feed ID (most recently used last)
+        self._price_cache: "OrderedDict[str, PriceFeed]" = OrderedDict()
+        self._cache_ttl = 60  # Starting TTL for a feed (seconds)
+        self._ttl: Dict[str, int] = {}  # canonical feed ID -> adapted TTL
+        self._collection_map: Dict[str, str] = {}  # asset_id -> canonical feed ID
+        self._inflight: Dict[str, asyncio.Future] = {}  # canonical feed ID -> fetch
     
-    async def get_price(self, asset_id: str) -> Optional[PriceFeed]:
+    def register_collection(self, asset_id: str, canonical_id: str) -> None:
+        """
+        Price an asset from another asset's feed.
+        
+        Assets sharing a feed (e.g. wrapped or bridged variants) then share
+        one cache entry, so pricing one of them prices the rest.
+        
+        Args:
+            asset_id: Asset identifier
+            canonical_id: Asset identifier whose feed prices it
+        """
+        self._collection_map[asset_id] = canonical_id
+    
+    async def get_price(
+        self,
+        asset_id: str,
+        max_age: Optional[int] = None
+    ) -> Optional[PriceFeed]:
         """
         Get current price for an asset.
         
         Args:
             asset_id: Asset identifier
+            max_age: Reject feeds older than this many seconds (None
+                accepts any age)
         
         Returns:
-            PriceFeed if available, None otherwise
+            PriceFeed if available (and fresh enough), None otherwise
         """
+        canonical_id = self._collection_map.get(asset_id, asset_id)
+        
         # Check cache first
-        if asset_id in self._price_cache:
-            cached = self._price_cache[asset_id]
-            if not cached.is_stale(self._cache_ttl):
-                logger.debug(f"Price cache hit for {asset_id[:8]}...")
-                return cached
-        
-        # Fetch new price
-        price_feed = await self._fetch_price(asset_id)
-        
-        if price_feed:
-            self._price_cache[asset_id] = price_feed
-            logger.info(
-                f"Price fetched for {asset_id[:8]}...: "
-                f"${price_feed.price / RAY:,.2f}"
-            )
+        cached = self._price_cache.get(canonical_id)
+        ttl = self._ttl.get(canonical_id, self._cache_ttl)
+        if max_age is not None:
+            ttl = min(ttl, max_age)
+        if cached and not cached.is_stale(ttl):
+            self._price_cache.move_to_end(canonical_id)
+            logger.debug("Price cache hit for {:.8}...", asset_id)
+            return self._for_asset(cached, asset_id)
+        
+        # Fetch new price; concurrent misses on the same feed share one fetch
+        refresh = self._inflight.get(canonical_id)
+        if refresh is None:
+            refresh = asyncio.ensure_future(self._refresh_price(canonical_id))
+            self._inflight[canonical_id] = refresh
+            refresh.add_done_callback(lambda _: self._inflight.pop(canonical_id, None))
+        
+        # Shielded so one cancelled caller does not cancel the shared fetch
+        price_feed = await asyncio.shield(refresh)
+        
+        if not price_feed:
+            return None
+        
+        # The oracle itself may report an old update
+        if max_age is not None and price_feed.is_stale(max_age):
+            logger.warning(f"Price for {asset_id[:8]}... is stale")
+            return None
+        
+        return self._for_asset(price_feed, asset_id)
+    
+    async def _refresh_price(self, canonical_id: str) -> Optional[PriceFeed]:
+        """
+        Fetch a feed, cache it and adapt its TTL.
+        
+        Args:
+            canonical_id: Canonical feed ID
+        
+        Returns:
+            PriceFeed if found, None otherwise
+        """
+        price_feed = await self._fetch_price(canonical_id)
+        
+        if not price_feed:
+            return None
+        
+        cached = self._price_cache.get(canonical_id)
+        if cached:
+            ttl = self._ttl.get(canonical_id, self._cache_ttl)
+            if price_feed.price == cached.price:
+                self._ttl[canonical_id] = min(ttl * 2, self.MAX_CACHE_TTL)
+            else:
+                self._ttl[canonical_id] = max(ttl // 2, self.MIN_CACHE_TTL)
+        
+        self._price_cache[canonical_id] = price_feed
+        self._price_cache.move_to_end(canonical_id)
+        if len(self._price_cache) > self.MAX_CACHED_FEEDS:
+            evicted_id, _ = self._price_cache.popitem(last=False)
+            self._ttl.pop(evicted_id, None)
+        
+        logger.info(
+            f"Price fetched for {canonical_id[:8]}...: "
+            f"${price_feed.price / RAY:,.2f}"
+        )
         
         return price_feed
     
+    @staticmethod
+    def _for_asset(price_feed: PriceFeed, asset_id: str) -> PriceFeed:
+        """Return the feed labelled with the requested asset ID."""
+        if price_feed.asset_id == asset_id:
+            return price_feed
+        return PriceFeed(
+            asset_id=asset_id,
+            price=price_feed.price,
+            timestamp=price_feed.timestamp,
+            signature=price_feed.signature,
+        )
+    
     async def _fetch_price(self, asset_id: str) -> Optional[PriceFeed]:
         """
         Fetch price from oracle (simulated for MVP).
@@ -119,7 +229,7 @@ class OracleService:
             return PriceFeed(
                 asset_id=asset_id,
                 price=self._SIMULATED_PRICES[asset_id],
-                timestamp=datetime.utcnow(),
+                timestamp=int(time.time()),
                 signature=None  # No signature verification in MVP
             )
         
@@ -136,14 +246,16 @@ class OracleService:
         Returns:
             Dictionary mapping asset_id to PriceFeed
         """
-        prices = {}
-        
-        for asset_id in asset_ids:
-            price_feed = await self.get_price(asset_id)
-            if price_feed:
-                prices[asset_id] = price_feed
+        # Independent lookups, so pay one round trip rather than one per asset
+        price_feeds = await asyncio.gather(
+            *(self.get_price(asset_id) for asset_id in asset_ids)
+        )
         
-        return prices
+        return {
+            asset_id: price_feed
+            for asset_id, price_feed in zip(asset_ids, price_feeds)
+            if price_feed
+        }
     
     def verify_signature(self, price_feed: PriceFeed, public_key: str) -> bool:
         """
@@ -176,16 +288,19 @@ class OracleService:
         Returns:
             Value in USD (RAY precision)
         """
-        from ..utils.ray_math import ray_mul
-        
         # Convert satoshis to base units (assuming 8 decimals)
         # amount is in satoshis, price is per whole unit
         # value = (amount / 10^8) * price
-        value = ray_mul(amount, price) // 100000000
+        value = (amount * price + HALF_RAY) // _VALUE_DIVISOR
         
-        logger.debug(
-            f"Value calculation: {amount} satoshis of {asset_id[:8]}... "
-            f"at ${price/RAY:,.2f} = ${value/RAY:,.2f}"
+        # Runs once per position during valuation: lazy, so the float
+        # conversions only happen when DEBUG is actually emitted
+        logger.opt(lazy=True).debug(
+            "Value calculation: {} satoshis of {:.8}... at ${:,.2f} = ${:,.2f}",
+            lambda: amount,
+            lambda: asset_id,
+            lambda: price / RAY,
+            lambda: value / RAY,
         )
         
         return value
@@ -201,13 +316,9 @@ class OracleService:
         Returns:
             Value in USD (RAY precision), None if price unavailable
         """
-        price_feed = await self.get_price(asset_id)
+        price_feed = await self.get_price(asset_id, max_age=self.MAX_PRICE_AGE)
         
         if not price_feed:
             return None
         
-        if price_feed.is_stale():
-            logger.warning(f"Price for {asset_id[:8]}... is stale")
-            return None
-        
         return self.calculate_value(amount, asset_id, price_feed.price)
@@ -0,0 +1,38 @@
+"""
+In-process cache of reserve state for read-only paths.
+
+Reserve rows change only on supply/withdraw/borrow/liquidate, while nearly
+every read endpoint needs them. Snapshots of the column values are kept for a
+short TTL and dropped explicitly after each write.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from ..models.reserve_state import ReserveState
+
+# Seconds a cached reserve snapshot may be served to read-only callers
+RESERVE_CACHE_TTL = 2.0
+
+# Read-through cache of reserve rows: asset_id -> (fetched_at, column values)
+reserve_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def snapshot_reserve(reserve: ReserveState) -> Dict[str, Any]:
+    """Copy a reserve's column values so they outlive the session."""
+    return {
+        attr.key: getattr(reserve, attr.key)
+        for attr in ReserveState.__mapper__.column_attrs
+    }
+
+
+def invalidate_reserve_cache(asset_id: Optional[str] = None) -> None:
+    """
+    Drop cached reserve state after a write.
+    
+    Args:
+        asset_id: Asset to invalidate (None clears the whole cache)
+    """
+    if asset_id is None:
+        reserve_cache.clear()
+    else:
+        reserve_cache.pop(asset_id, None)
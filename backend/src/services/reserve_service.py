@@ -2,12 +2,13 @@
 Reserve service for managing lending pool operations.
 """
 
+import asyncio
 import time
-from typing import Optional
+from typing import Any, Coroutine, Dict, Iterable, Optional, Set
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
 
 from ..models.reserve_state import ReserveState
 from ..models.supply_position import SupplyPosition
@@ -16,6 +17,70 @@ from ..utils.ray_math import RAY
 from .interest_calculator import InterestCalculator
 from .interest_rate_model import InterestRateModel
 from .coordinator import CoordinatorService
+from .reserve_cache import (
+    RESERVE_CACHE_TTL,
+    invalidate_reserve_cache,
+    reserve_cache,
+    snapshot_reserve,
+)
+
+
+# Hot lookups, built once so every call reuses the same cached compiled form
+_SELECT_USER_BY_ADDRESS = select(User).where(User.address == bindparam("address"))
+_SELECT_RESERVE_BY_ASSET = select(ReserveState).where(
+    ReserveState.asset_id == bindparam("asset_id")
+)
+_SELECT_SUPPLY_POSITIONS_BY_ADDRESS = (
+    select(
+        SupplyPosition.id,
+        SupplyPosition.atoken_amount,
+        SupplyPosition.liquidity_index_at_supply,
+    )
+    .join(User, SupplyPosition.user_id == User.id)
+    .where(
+        User.address == bindparam("address"),
+        SupplyPosition.asset_id == bindparam("asset_id"),
+    )
+    .order_by(SupplyPosition.id)
+)
+
+# Post-commit broadcasts still running; the event loop only keeps weak
+# references to tasks, so hold them here until they finish
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> asyncio.Task:
+    """Run a coroutine in the background, keeping it alive until done."""
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+
+async def drain_background_tasks(timeout: float = 10.0) -> None:
+    """
+    Wait for in-flight post-commit broadcasts, cancelling any that overrun.
+    
+    Call on shutdown before the engine and RPC/lock clients are closed.
+    
+    Args:
+        timeout: Seconds to wait before cancelling what is still running
+    """
+    if not _background_tasks:
+        return
+    
+    pending = set(_background_tasks)
+    logger.info("Waiting for {} background broadcast(s) to finish", len(pending))
+    
+    _, still_running = await asyncio.wait(pending, timeout=timeout)
+    if still_running:
+        logger.warning(
+            "Cancelling {} background broadcast(s) still running at shutdown",
+            len(still_running),
+        )
+        for task in still_running:
+            task.cancel()
+        await asyncio.gather(*still_running, return_exceptions=True)
 
 
 class ReserveService:
@@ -51,7 +116,7 @@ class ReserveService:
             ReserveState or None if not found
         """
         result = await self.session.execute(
-            select(ReserveState).where(ReserveState.asset_id == asset_id)
+            _SELECT_RESERVE_BY_ASSET, {"asset_id": asset_id}
         )
         return result.scalar_one_or_none()
     
@@ -68,7 +133,12 @@ class ReserveService:
             Updated reserve state
         """
         current_time = int(time.time())
-        
+
+        # Nothing has accrued since the last update (e.g. several
+        # operations in the same second): skip the compounding entirely
+        if current_time <= reserve.last_update_timestamp:
+            return reserve
+
         # Calculate new indices
         new_liquidity_index, new_borrow_index = (
             self.interest_calculator.accrue_indices(
@@ -171,26 +241,54 @@ class ReserveService:
             f"amount={amount}, atoken_amount={atoken_amount}"
         )
         
+        # The INSERT already returns id/created_at/updated_at, so the
+        # position needs no refresh after commit
         await self.session.commit()
-        await self.session.refresh(position)
+        invalidate_reserve_cache(asset_id)
         
-        # Assemble and broadcast transaction (async, non-blocking for MVP)
+        # Assemble and broadcast transaction off the request path
+        _spawn(self._post_supply(position.id, reserve.id, user_address, amount))
+        
+        return position
+    
+    async def _post_supply(
+        self,
+        position_id: int,
+        reserve_id: int,
+        user_address: str,
+        amount: int,
+    ) -> None:
+        """
+        Assemble and broadcast a committed supply (non-blocking).
+        
+        Runs after the request has returned, so it works on its own session
+        rather than the request's, which is closed by then.
+        
+        Args:
+            position_id: Committed supply position
+            reserve_id: Reserve the supply went into
+            user_address: User's address
+            amount: Supplied amount in satoshis
+        """
         try:
-            tx_id = await self.coordinator.assemble_supply_transaction(
-                position=position,
-                reserve=reserve,
-                user_address=user_address,
-                amount=amount,
-            )
+            async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+                # Re-load both rows: the request session's instances must not
+                # cross into this one
+                position = await session.get(SupplyPosition, position_id)
+                reserve = await session.get(ReserveState, reserve_id)
+                tx_id = await CoordinatorService(session).assemble_supply_transaction(
+                    position=position,
+                    reserve=reserve,
+                    user_address=user_address,
+                    amount=amount,
+                )
             
             if tx_id:
-                logger.info(f"Supply transaction broadcast: {tx_id}")
+                logger.info("Supply transaction broadcast: {}", tx_id)
             else:
                 logger.warning("Supply transaction assembly failed (non-blocking)")
         except Exception as e:
-            logger.error(f"Error in coordinator (non-blocking): {e}", exc_info=True)
-        
-        return position
+            logger.exception("Error in coordinator (non-blocking): {}", e)
     
     async def withdraw(
         self,
@@ -212,13 +310,22 @@ class ReserveService:
         if amount < 0:
             raise ValueError("Withdraw amount cannot be negative")
 
-        # Get user
+        # Get user's supply positions for this asset, oldest first; joining
+        # on the address saves a separate user lookup
         result = await self.session.execute(
-            select(User).where(User.address == user_address)
+            _SELECT_SUPPLY_POSITIONS_BY_ADDRESS,
+            {"address": user_address, "asset_id": asset_id},
         )
-        user = result.scalar_one_or_none()
-        if not user:
-            raise ValueError("User not found")
+        positions = result.all()
+
+        if not positions:
+            # Only the failure path needs to tell an unknown user apart
+            result = await self.session.execute(
+                _SELECT_USER_BY_ADDRESS, {"address": user_address}
+            )
+            if not result.scalar_one_or_none():
+                raise ValueError("User not found")
+            raise ValueError("No supply positions for this asset")
 
         # Get reserve
         reserve = await self.get_reserve_state(asset_id)
@@ -228,23 +335,13 @@ class ReserveService:
         # Update indices
         reserve = await self.update_indices(reserve)
 
-        # Get user's supply positions for this asset
-        result = await self.session.execute(
-            select(SupplyPosition).where(
-                SupplyPosition.user_id == user.id,
-                SupplyPosition.asset_id == asset_id,
-            )
-        )
-        positions = result.scalars().all()
-
-        if not positions:
-            raise ValueError("No supply positions for this asset")
-
         # Calculate total underlying available and total aTokens
         total_underlying = 0
         total_atokens = 0
         for pos in positions:
-            total_underlying += pos.calculate_underlying_amount(reserve.liquidity_index)
+            total_underlying += SupplyPosition.scale_underlying(
+                pos.atoken_amount, reserve.liquidity_index, pos.liquidity_index_at_supply
+            )
             total_atokens += pos.atoken_amount
 
         if total_underlying <= 0 or total_atokens <= 0:
@@ -270,19 +367,42 @@ class ReserveService:
         if atoken_to_burn <= 0:
             raise ValueError("Calculated aToken burn amount is zero")
 
-        # Burn aTokens from positions (FIFO)
+        # Burn aTokens from positions (FIFO): every position but the last one
+        # touched is emptied, so the plan is a set of ids to zero plus at
+        # most one partial balance
         remaining_to_burn = atoken_to_burn
+        emptied_ids = []
+        partial = None
         for pos in positions:
             if remaining_to_burn <= 0:
                 break
-            burn_here = min(pos.atoken_amount, remaining_to_burn)
-            pos.atoken_amount -= burn_here
-            remaining_to_burn -= burn_here
+            if pos.atoken_amount <= remaining_to_burn:
+                emptied_ids.append(pos.id)
+                remaining_to_burn -= pos.atoken_amount
+            else:
+                partial = (pos.id, pos.atoken_amount - remaining_to_burn)
+                remaining_to_burn = 0
 
         if remaining_to_burn > 0:
             # Guard: should not happen due to checks above
             raise ValueError("Not enough aTokens to burn for withdrawal")
 
+        # Positions were read as plain rows, so apply the plan directly in
+        # at most two UPDATE statements
+        if emptied_ids:
+            await self.session.execute(
+                update(SupplyPosition)
+                .where(SupplyPosition.id.in_(emptied_ids))
+                .values(atoken_amount=0)
+            )
+        if partial:
+            partial_id, partial_balance = partial
+            await self.session.execute(
+                update(SupplyPosition)
+                .where(SupplyPosition.id == partial_id)
+                .values(atoken_amount=partial_balance)
+            )
+
         # Update reserve liquidity
         reserve.total_liquidity -= amount_to_withdraw
 
@@ -295,42 +415,117 @@ class ReserveService:
         )
 
         await self.session.commit()
+        invalidate_reserve_cache(asset_id)
 
-        # Assemble and broadcast withdraw transaction (simulated)
+        # Assemble and broadcast withdraw transaction off the request path
+        _spawn(self._post_withdraw(user_address, asset_id, amount_to_withdraw))
+
+        return amount_to_withdraw, atoken_to_burn, reserve.liquidity_index
+    
+    async def _post_withdraw(
+        self,
+        user_address: str,
+        asset_id: str,
+        amount: int,
+    ) -> None:
+        """
+        Assemble and broadcast a committed withdraw (non-blocking).
+        
+        Runs after the request has returned, so like _post_supply it works on
+        its own session rather than the request's.
+        
+        Args:
+            user_address: User's address
+            asset_id: Withdrawn asset
+            amount: Withdrawn amount in satoshis
+        """
         try:
-            tx_id = await self.coordinator.assemble_withdraw_transaction(
-                user_address=user_address,
-                asset_id=asset_id,
-                amount=amount_to_withdraw,
-            )
+            async with AsyncSession(self.session.bind, expire_on_commit=False) as session:
+                tx_id = await CoordinatorService(session).assemble_withdraw_transaction(
+                    user_address=user_address,
+                    asset_id=asset_id,
+                    amount=amount,
+                )
+            
             if tx_id:
-                logger.info(f"Withdraw transaction broadcast: {tx_id}")
+                logger.info("Withdraw transaction broadcast: {}", tx_id)
             else:
                 logger.warning("Withdraw transaction assembly failed (non-blocking)")
         except Exception as e:
-            logger.error(f"Error in coordinator (non-blocking): {e}", exc_info=True)
-
-        return amount_to_withdraw, atoken_to_burn, reserve.liquidity_index
+            logger.exception("Error in coordinator (non-blocking): {}", e)
     
-    async def get_reserve_state_with_accrued_interest(
+    async def get_reserve_states(self, asset_ids: Iterable[str]) -> Dict[str, ReserveState]:
+        """
+        Get reserve states for several assets in a single query.
+        
+        Args:
+            asset_ids: Liquid asset IDs
+        
+        Returns:
+            Mapping of asset_id to ReserveState (missing assets are omitted)
+        """
+        asset_ids = set(asset_ids)
+        if not asset_ids:
+            return {}
+        
+        result = await self.session.execute(
+            select(ReserveState).where(ReserveState.asset_id.in_(asset_ids))
+        )
+        return {reserve.asset_id: reserve for reserve in result.scalars().all()}
+    
+    async def get_cached_reserve_states(
         self,
-        asset_id: str
-    ) -> Optional[ReserveState]:
+        asset_ids: Iterable[str],
+    ) -> Dict[str, ReserveState]:
         """
-        Get reserve state with accrued interest (without persisting).
+        Get reserve states for read-only use, served from a short TTL cache.
+        
+        Returned objects are detached copies: they may lag the database by up
+        to RESERVE_CACHE_TTL seconds and changes to them are never persisted.
+        Use get_reserve_state/get_reserve_states for anything that writes.
         
         Args:
-            asset_id: Liquid asset ID
+            asset_ids: Liquid asset IDs
         
         Returns:
-            Reserve state with updated indices
+            Mapping of asset_id to detached ReserveState copies
         """
-        reserve = await self.get_reserve_state(asset_id)
-        if not reserve:
-            return None
+        now = time.monotonic()
+        values: Dict[str, Dict[str, Any]] = {}
+        missing = set()
+        
+        for asset_id in set(asset_ids):
+            cached = reserve_cache.get(asset_id)
+            if cached and now - cached[0] < RESERVE_CACHE_TTL:
+                values[asset_id] = cached[1]
+            else:
+                missing.add(asset_id)
         
-        # Calculate updated indices without persisting
-        current_time = int(time.time())
+        if missing:
+            for asset_id, reserve in (await self.get_reserve_states(missing)).items():
+                snapshot = snapshot_reserve(reserve)
+                reserve_cache[asset_id] = (now, snapshot)
+                values[asset_id] = snapshot
+        
+        return {asset_id: ReserveState(**snapshot) for asset_id, snapshot in values.items()}
+    
+    def apply_accrued_interest(
+        self,
+        reserve: ReserveState,
+        current_time: Optional[int] = None,
+    ) -> ReserveState:
+        """
+        Accrue interest on a reserve's indices in memory (without persisting).
+        
+        Args:
+            reserve: Reserve state to update
+            current_time: Unix timestamp to accrue to (default: now)
+        
+        Returns:
+            Reserve state with updated indices
+        """
+        if current_time is None:
+            current_time = int(time.time())
         time_delta = current_time - reserve.last_update_timestamp
         
         if time_delta > 0:
@@ -344,12 +539,32 @@ class ReserveService:
                 )
             )
             
-            # Create a copy with updated values (don't modify original)
             reserve.liquidity_index = new_liquidity_index
             reserve.variable_borrow_index = new_borrow_index
         
         return reserve
     
+    async def get_reserve_state_with_accrued_interest(
+        self,
+        asset_id: str
+    ) -> Optional[ReserveState]:
+        """
+        Get reserve state with accrued interest (without persisting).
+        
+        Served from the reserve cache; the returned object is a detached copy.
+        
+        Args:
+            asset_id: Liquid asset ID
+        
+        Returns:
+            Reserve state with updated indices
+        """
+        reserve = (await self.get_cached_reserve_states([asset_id])).get(asset_id)
+        if not reserve:
+            return None
+        
+        return self.apply_accrued_interest(reserve)
+    
     async def _get_or_create_user(self, address: str) -> User:
         """
         Get existing user or create new one.
@@ -361,7 +576,7 @@ class ReserveService:
             User instance
         """
         result = await self.session.execute(
-            select(User).where(User.address == address)
+            _SELECT_USER_BY_ADDRESS, {"address": address}
         )
         user = result.scalar_one_or_none()
         
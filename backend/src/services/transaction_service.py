@@ -2,12 +2,11 @@
 Transaction history service for audit logging.
 """
 
-import json
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
-from sqlalchemy import select, and_, or_, desc
+from sqlalchemy import func, insert, select, and_, or_, desc
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.transaction import Transaction, TransactionType, TransactionStatus
@@ -40,7 +39,7 @@ class TransactionService:
             amount: Transaction amount in satoshis
             metadata: Additional context (dict)
             position_id: Related position ID if applicable
-            tx_hash: On-chain transaction hash
+            tx_hash: On-chain transaction hash (hex)
             status: Transaction status
         
         Returns:
@@ -52,16 +51,17 @@ class TransactionService:
                 user_address=user_address,
                 asset_id=asset_id,
                 amount=amount,
-                metadata=json.dumps(metadata) if metadata else None,
+                tx_metadata=metadata or None,
                 position_id=position_id,
-                tx_hash=tx_hash,
+                tx_hash=bytes.fromhex(tx_hash) if tx_hash else None,
                 status=status.value,
                 reserve_asset_id=asset_id,
             )
             
+            # Every default is client-side and the id comes back from the
+            # INSERT, so the committed object is complete without a refresh
             self.session.add(tx)
             await self.session.commit()
-            await self.session.refresh(tx)
             
             logger.info(
                 f"Transaction logged: type={tx_type.value}, "
@@ -75,6 +75,53 @@ class TransactionService:
             await self.session.rollback()
             raise
     
+    async def log_transactions(self, entries: List[Dict[str, Any]]) -> int:
+        """
+        Log several transactions to the audit trail in one statement.
+        
+        Rows are inserted through Core as a single executemany INSERT and
+        one commit, skipping per-row ORM instance construction and
+        unit-of-work bookkeeping. Use log_transaction when the created
+        record (and its id) is needed.
+        
+        Args:
+            entries: Dicts with the keyword arguments of log_transaction
+                (tx_type, user_address, asset_id, amount, and optionally
+                metadata, position_id, tx_hash, status)
+        
+        Returns:
+            Number of transactions logged
+        """
+        if not entries:
+            return 0
+        
+        rows = [
+            {
+                "tx_type": entry["tx_type"].value,
+                "user_address": entry["user_address"],
+                "asset_id": entry["asset_id"],
+                "amount": entry["amount"],
+                "tx_metadata": entry.get("metadata") or None,
+                "position_id": entry.get("position_id"),
+                "tx_hash": bytes.fromhex(entry["tx_hash"]) if entry.get("tx_hash") else None,
+                "status": entry.get("status", TransactionStatus.PENDING).value,
+                "reserve_asset_id": entry["asset_id"],
+            }
+            for entry in entries
+        ]
+        
+        try:
+            await self.session.execute(insert(Transaction), rows)
+            await self.session.commit()
+        
+        except Exception as e:
+            logger.error(f"Failed to log {len(rows)} transactions: {e}", exc_info=True)
+            await self.session.rollback()
+            raise
+        
+        logger.info(f"Transactions logged: count={len(rows)}")
+        return len(rows)
+    
     async def update_transaction_status(
         self,
         transaction_id: int,
@@ -89,7 +136,7 @@ class TransactionService:
         Args:
             transaction_id: Transaction ID to update
             status: New status
-            tx_hash: On-chain transaction hash
+            tx_hash: On-chain transaction hash (hex)
             result_data: Result data (dict)
             error_message: Error message if failed
         
@@ -108,10 +155,10 @@ class TransactionService:
             tx.status = status.value
             
             if tx_hash:
-                tx.tx_hash = tx_hash
+                tx.tx_hash = bytes.fromhex(tx_hash)
             
             if result_data:
-                tx.result_data = json.dumps(result_data)
+                tx.result_data = result_data
             
             if error_message:
                 tx.error_message = error_message
@@ -120,7 +167,6 @@ class TransactionService:
                 tx.confirmed_at = datetime.utcnow()
             
             await self.session.commit()
-            await self.session.refresh(tx)
             
             logger.info(
                 f"Transaction {transaction_id} updated: status={status.value}"
@@ -267,14 +313,14 @@ class TransactionService:
         Get transaction by on-chain hash.
         
         Args:
-            tx_hash: On-chain transaction hash
+            tx_hash: On-chain transaction hash (hex)
         
         Returns:
             Transaction record or None
         """
         try:
             result = await self.session.execute(
-                select(Transaction).where(Transaction.tx_hash == tx_hash)
+                select(Transaction).where(Transaction.tx_hash == bytes.fromhex(tx_hash))
             )
             return result.scalar_one_or_none()
         
@@ -293,29 +339,37 @@ class TransactionService:
             Statistics dictionary
         """
         try:
-            query = select(Transaction)
+            # Aggregate in the database: one row per (type, status) pair
+            # instead of loading every Transaction into memory
+            query = select(
+                Transaction.tx_type,
+                Transaction.status,
+                func.count(),
+                func.coalesce(func.sum(Transaction.amount), 0),
+            ).group_by(Transaction.tx_type, Transaction.status)
             if user_address:
                 query = query.where(Transaction.user_address == user_address)
             
             result = await self.session.execute(query)
-            transactions = result.scalars().all()
             
             stats = {
-                "total_transactions": len(transactions),
+                "total_transactions": 0,
                 "by_type": {},
                 "by_status": {},
                 "total_volume": 0,
             }
             
-            for tx in transactions:
+            for tx_type, tx_status, count, volume in result:
+                stats["total_transactions"] += count
+                
                 # Count by type
-                stats["by_type"][tx.tx_type] = stats["by_type"].get(tx.tx_type, 0) + 1
+                stats["by_type"][tx_type] = stats["by_type"].get(tx_type, 0) + count
                 
                 # Count by status
-                stats["by_status"][tx.status] = stats["by_status"].get(tx.status, 0) + 1
+                stats["by_status"][tx_status] = stats["by_status"].get(tx_status, 0) + count
                 
                 # Sum volume
-                stats["total_volume"] += tx.amount
+                stats["total_volume"] += int(volume)
             
             return stats
         
@@ -4,14 +4,41 @@ Elements/Liquid Network RPC Client Wrapper
 Provides interface to Elements Core node for UTXO operations.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import httpx
+import orjson
 from loguru import logger
 
 from ..config import settings
 
 
+class RpcError(Exception):
+    """
+    Error returned by the Elements node for an RPC call.
+    
+    Attributes:
+        code: JSON-RPC error code (None for malformed replies)
+        message: Error message from the node
+        data: Extra error data, if any
+    """
+    
+    __slots__ = ("code", "message", "data")
+    
+    def __init__(self, code: Optional[int], message: str, data: Any = None):
+        super().__init__(code, message, data)
+        self.code = code
+        self.message = message
+        self.data = data
+    
+    def __str__(self) -> str:
+        if self.code is None:
+            return f"RPC error: {self.message}"
+        return f"RPC error {self.code}: {self.message}"
+
+
 class LiquidClient:
     """
     Wrapper for Elements Core RPC calls.
@@ -23,11 +50,28 @@ class LiquidClient:
     - Block and mempool monitoring
     """
     
+    # Result cache lifetimes (seconds)
+    BLOCKCHAIN_INFO_TTL = 2
+    CONFIRMED_UTXO_TTL = 60  # also dropped as soon as a new block is seen
+    ASSET_INFO_TTL = 3600
+    
+    # Expired entries are swept once the cache grows past this
+    MAX_CACHE_ENTRIES = 4096
+    
+    # Fixed part of every single-call request; copied and filled per call
+    _PAYLOAD_TEMPLATE: Dict[str, Any] = {
+        "jsonrpc": "2.0",
+        "id": "fantasma",
+        "method": None,
+        "params": None,
+    }
+    
     def __init__(
         self,
         rpc_url: Optional[str] = None,
         rpc_user: Optional[str] = None,
         rpc_password: Optional[str] = None,
+        max_inflight: Optional[int] = None,
     ):
         """
         Initialize Liquid RPC client.
@@ -36,6 +80,7 @@ class LiquidClient:
             rpc_url: Elements RPC URL (default from settings)
             rpc_user: RPC username (default from settings)
             rpc_password: RPC password (default from settings)
+            max_inflight: Maximum concurrent RPCs (default from settings)
         """
         self.rpc_url = rpc_url or settings.ELEMENTS_RPC_URL
         self.rpc_user = rpc_user or settings.ELEMENTS_RPC_USER
@@ -43,6 +88,78 @@ class LiquidClient:
         
         self.auth = (self.rpc_user, self.rpc_password)
         self.headers = {"content-type": "application/json"}
+        
+        # One pooled client for the lifetime of this wrapper, so RPCs reuse
+        # keep-alive connections instead of reconnecting on every call
+        self._client = httpx.AsyncClient(
+            auth=self.auth,
+            headers=self.headers,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64,
+                keepalive_expiry=60,
+            ),
+        )
+        
+        # Caps in-flight RPCs; past the node's work queue, extra requests
+        # are rejected or time out instead of running any sooner
+        self._inflight = asyncio.Semaphore(
+            max_inflight or settings.ELEMENTS_RPC_MAX_INFLIGHT
+        )
+        
+        # (method, *params) -> (expires_at, result)
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._best_block_hash: Optional[str] = None
+    
+    async def aclose(self) -> None:
+        """Close pooled connections to the Elements node."""
+        await self._client.aclose()
+    
+    async def _cached_call(
+        self,
+        method: str,
+        params: List[Any],
+        ttl: float,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Make an RPC call, serving repeats from an in-process TTL cache.
+        
+        Args:
+            method: RPC method name
+            params: Method parameters (hashable scalars)
+            ttl: Seconds a result stays cached
+            cache_if: Predicate a result must pass to be cached (None
+                caches every result)
+        
+        Returns:
+            RPC response result
+        """
+        key = (method, *params)
+        
+        cached = self._cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        result = await self._call(method, params)
+        
+        if cache_if is None or cache_if(result):
+            self._cache_put(key, ttl, result)
+        
+        return result
+    
+    def _cache_put(self, key: Tuple, ttl: float, result: Any) -> None:
+        """Cache an RPC result, sweeping expired entries when full."""
+        now = time.monotonic()
+        if len(self._cache) >= self.MAX_CACHE_ENTRIES:
+            self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+        self._cache[key] = (now + ttl, result)
+    
+    @staticmethod
+    def _is_confirmed(utxo: Optional[Dict[str, Any]]) -> bool:
+        """Whether a gettxout result is a confirmed (cacheable) output."""
+        return bool(utxo) and utxo.get("confirmations", 0) >= 1
     
     async def _call(self, method: str, params: List[Any] = []) -> Any:
         """
@@ -57,41 +174,109 @@ class LiquidClient:
         
         Raises:
             httpx.HTTPError: If RPC call fails
+            RpcError: If the node returns an error
         """
-        payload = {
-            "jsonrpc": "2.0",
-            "id": "fantasma",
-            "method": method,
-            "params": params,
-        }
-        
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.rpc_url,
-                    json=payload,
-                    auth=self.auth,
-                    headers=self.headers,
-                    timeout=30.0,
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                if "error" in data and data["error"] is not None:
-                    error = data["error"]
-                    logger.error(f"RPC error: {error}")
-                    raise Exception(f"RPC error: {error['message']}")
-                
-                return data.get("result")
+        payload = self._PAYLOAD_TEMPLATE.copy()
+        payload["method"] = method
+        payload["params"] = params
+        
+        try:
+            # orjson on both ends: listunspent replies can hold thousands of
+            # entries (the client already sends the JSON content-type)
+            async with self._inflight:
+                response = await self._client.post(self.rpc_url, content=orjson.dumps(payload))
+            response.raise_for_status()
+            
+            data = orjson.loads(response.content)
             
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP error calling {method}: {e}")
-                raise
+            if "error" in data and data["error"] is not None:
+                error = data["error"]
+                logger.error("RPC error: {}", error)
+                raise RpcError(error.get("code"), error.get("message"), error.get("data"))
+            
+            return data.get("result")
+        
+        except httpx.HTTPError as e:
+            logger.error("HTTP error calling {}: {}", method, e)
+            raise
+    
+    async def _call_batch(self, calls: List[Tuple[str, List[Any]]]) -> List[Any]:
+        """
+        Make several RPC calls in one JSON-RPC batch request.
+        
+        Args:
+            calls: (method, params) pairs
+        
+        Returns:
+            RPC results, in the order of calls
+        
+        Raises:
+            httpx.HTTPError: If the request fails
+            RpcError: If any call in the batch returns an error, the whole
+                batch is rejected, or a reply is missing
+        """
+        if not calls:
+            return []
+        
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        
+        try:
+            async with self._inflight:
+                response = await self._client.post(self.rpc_url, content=orjson.dumps(payload))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.error("HTTP error calling batch of {}: {}", len(calls), e)
+            raise
+        
+        data = orjson.loads(response.content)
+        
+        # A request-level failure comes back as one error object, not a list
+        if not isinstance(data, list):
+            error = data.get("error") if isinstance(data, dict) else None
+            logger.error("RPC error for batch of {}: {}", len(calls), error or data)
+            if error:
+                raise RpcError(error.get("code"), error.get("message"), error.get("data"))
+            raise RpcError(None, "Malformed batch response")
+        
+        if len(data) != len(calls):
+            logger.error("Batch of {} got {} replies", len(calls), len(data))
+            raise RpcError(None, f"Batch of {len(calls)} got {len(data)} replies")
+        
+        # The node may answer batch entries in any order
+        replies = {reply.get("id"): reply for reply in data if isinstance(reply, dict)}
+        
+        results = []
+        for i, (method, _) in enumerate(calls):
+            reply = replies.get(i)
+            if reply is None:
+                logger.error("No reply for batched {} (id {})", method, i)
+                raise RpcError(None, f"No reply for batched {method} (id {i})")
+            if reply.get("error") is not None:
+                error = reply["error"]
+                logger.error("RPC error in batched {}: {}", method, error)
+                raise RpcError(error.get("code"), error.get("message"), error.get("data"))
+            results.append(reply.get("result"))
+        
+        return results
     
     async def get_blockchain_info(self) -> Dict[str, Any]:
         """Get blockchain information."""
-        return await self._call("getblockchaininfo")
+        info = await self._cached_call("getblockchaininfo", [], self.BLOCKCHAIN_INFO_TTL)
+        
+        # A new tip can spend cached UTXOs: drop them
+        best_block_hash = info.get("bestblockhash")
+        if best_block_hash != self._best_block_hash:
+            if self._best_block_hash is not None:
+                self._cache = {
+                    key: entry for key, entry in self._cache.items()
+                    if key[0] != "gettxout"
+                }
+            self._best_block_hash = best_block_hash
+        
+        return info
     
     async def get_utxo(self, txid: str, vout: int) -> Optional[Dict[str, Any]]:
         """
@@ -104,8 +289,53 @@ class LiquidClient:
         Returns:
             UTXO data or None if spent/not found
         """
-        result = await self._call("gettxout", [txid, vout, True])
-        return result
+        # Only confirmed outputs are cached; mempool ones can vanish any time
+        return await self._cached_call(
+            "gettxout",
+            [txid, vout, True],
+            self.CONFIRMED_UTXO_TTL,
+            cache_if=self._is_confirmed,
+        )
+    
+    async def get_utxos_batch(
+        self,
+        outpoints: List[Tuple[str, int]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get several UTXOs in one round trip.
+        
+        Shares get_utxo's cache: cached outputs are not re-fetched, and
+        confirmed outputs fetched here are cached, so calling this up
+        front prefetches the outputs a coin-selection loop will query.
+        
+        Args:
+            outpoints: (txid, vout) pairs
+        
+        Returns:
+            UTXO data (None if spent/not found), in the order of outpoints
+        """
+        now = time.monotonic()
+        keys = [("gettxout", txid, vout, True) for txid, vout in outpoints]
+        
+        results: List[Optional[Dict[str, Any]]] = []
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                results.append(cached[1])
+            else:
+                results.append(None)
+                missing.append(i)
+        
+        fetched = await self._call_batch(
+            [("gettxout", list(keys[i][1:])) for i in missing]
+        )
+        for i, utxo in zip(missing, fetched):
+            results[i] = utxo
+            if self._is_confirmed(utxo):
+                self._cache_put(keys[i], self.CONFIRMED_UTXO_TTL, utxo)
+        
+        return results
     
     async def get_raw_transaction(
         self,
@@ -124,36 +354,87 @@ class LiquidClient:
         """
         return await self._call("getrawtransaction", [txid, verbose])
     
+    async def multi_get_utxo(
+        self,
+        outpoints: List[Tuple[str, int]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get several UTXOs with concurrent single calls.
+        
+        Fallback for endpoints that reject JSON-RPC batches (e.g. some
+        proxies); prefer get_utxos_batch otherwise.
+        
+        Args:
+            outpoints: (txid, vout) pairs
+        
+        Returns:
+            UTXO data (None if spent/not found), in the order of outpoints
+        """
+        return list(await asyncio.gather(
+            *(self.get_utxo(txid, vout) for txid, vout in outpoints)
+        ))
+    
+    async def get_raw_transactions_batch(
+        self,
+        txids: List[str],
+        verbose: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Get several raw transactions in one round trip.
+        
+        Args:
+            txids: Transaction IDs
+            verbose: Return decoded transactions (True) or hex (False)
+        
+        Returns:
+            Transaction data, in the order of txids
+        """
+        return await self._call_batch(
+            [("getrawtransaction", [txid, verbose]) for txid in txids]
+        )
+    
     async def list_unspent(
         self,
         min_conf: int = 1,
         max_conf: int = 9999999,
         addresses: Optional[List[str]] = None,
         asset: Optional[str] = None,
+        minimum_amount: Optional[float] = None,
+        maximum_count: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         List unspent UTXOs.
         
+        Filters are applied by the node, so excluded UTXOs are never
+        serialized or sent.
+        
         Args:
             min_conf: Minimum confirmations
             max_conf: Maximum confirmations
             addresses: Filter by addresses
             asset: Filter by asset ID
+            minimum_amount: Skip UTXOs below this amount (whole units)
+            maximum_count: Return at most this many UTXOs
         
         Returns:
             List of UTXOs
         """
-        params = [min_conf, max_conf]
-        if addresses:
-            params.append(addresses)
-        
-        utxos = await self._call("listunspent", params)
-        
-        # Filter by asset if specified
+        query_options: Dict[str, Any] = {}
         if asset:
-            utxos = [u for u in utxos if u.get("asset") == asset]
-        
-        return utxos
+            query_options["asset"] = asset
+        if minimum_amount is not None:
+            query_options["minimumAmount"] = minimum_amount
+        if maximum_count is not None:
+            query_options["maximumCount"] = maximum_count
+        
+        params: List[Any] = [min_conf, max_conf]
+        if addresses or query_options:
+            params.append(addresses or [])
+        if query_options:
+            # include_unsafe keeps the node's default; query_options follows it
+            params.extend([True, query_options])
+        
+        return await self._call("listunspent", params)
     
     async def create_raw_transaction(
         self,
@@ -282,8 +563,13 @@ class LiquidClient:
             Asset info or None
         """
         try:
-            return await self._call("getassetinfo", [asset_id])
-        except Exception:
+            return await self._cached_call(
+                "getassetinfo",
+                [asset_id],
+                self.ASSET_INFO_TTL,
+                cache_if=lambda info: info is not None,
+            )
+        except (RpcError, httpx.HTTPError):
             return None
 
 
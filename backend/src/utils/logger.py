@@ -17,6 +17,7 @@ def setup_logging() -> None:
     - Console output with color
     - File output with rotation
     - Different log levels for dev/prod
+    - Sinks are enqueued so log I/O happens off the event loop
     """
     
     # Remove default handler
@@ -28,6 +29,9 @@ def setup_logging() -> None:
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level=settings.LOG_LEVEL,
         colorize=True,
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
     
     # File handler with rotation
@@ -41,10 +45,15 @@ def setup_logging() -> None:
         rotation="10 MB",
         retention="7 days",
         compression="zip",
+        delay=True,  # create the file on the first record written to it
+        filter=lambda record: not record["extra"].get("console_only"),
+        enqueue=True,
+        backtrace=False,
+        diagnose=False,
     )
     
-    logger.info(f"Logging configured - Level: {settings.LOG_LEVEL}, File: {settings.LOG_FILE}")
-
-
-# Initialize logging on import
-setup_logging()
+    # Console only: writing this to the file sink would open it right away
+    # and defeat delay=True
+    logger.bind(console_only=True).info(
+        f"Logging configured - Level: {settings.LOG_LEVEL}, File: {settings.LOG_FILE}"
+    )
@@ -5,6 +5,7 @@ RAY = 10^27 precision for interest rate calculations (AAVE standard)
 All operations use Python's arbitrary precision integers to avoid overflow.
 """
 
+from fractions import Fraction
 from typing import Union
 
 # RAY constant: 10^27
@@ -16,6 +17,9 @@ HALF_RAY: int = RAY // 2
 # Seconds per year (365 days)
 SECONDS_PER_YEAR: int = 31536000
 
+# 10^|decimals - 27| for common token decimals, so conversions skip the pow
+_DECIMAL_SCALE: dict[int, int] = {d: 10 ** abs(d - 27) for d in (0, 6, 8, 9, 18, 27, 30)}
+
 
 def ray_mul(a: int, b: int) -> int:
     """
@@ -67,6 +71,37 @@ def ray_div(a: int, b: int) -> int:
     return (a * RAY + half_b) // b
 
 
+def ray_scale(amount: int, current_index: int, start_index: int) -> int:
+    """
+    Scale an amount by the growth of an index since it was recorded.
+    
+    Formula: (amount * current_index + start_index // 2) // start_index
+    
+    Equivalent to ray_mul(amount, ray_div(current_index, start_index)) but
+    with one big-int multiply/divide and a single rounding step, which
+    matters when scanning many positions.
+    
+    Args:
+        amount: Amount to scale (any precision)
+        current_index: Current index in RAY
+        start_index: Index when the amount was recorded, in RAY
+    
+    Returns:
+        Scaled amount in the same precision as ``amount``
+    
+    Raises:
+        ZeroDivisionError: If start_index is zero
+    
+    Example:
+        >>> ray_scale(1000, 11 * RAY // 10, RAY)  # 1000 * 1.1
+        1100
+    """
+    if start_index == 0:
+        raise ZeroDivisionError("Division by zero in ray_scale")
+    
+    return (amount * current_index + start_index // 2) // start_index
+
+
 def accrue_index(
     current_index: int,
     rate_per_second: int,
@@ -176,10 +211,11 @@ def ray_to_decimal(value: int, decimals: int = 18) -> int:
         >>> ray_to_decimal(RAY, 18)  # 1.0 RAY to 18 decimals
         1000000000000000000
     """
+    scale = _DECIMAL_SCALE.get(decimals) or 10 ** abs(decimals - 27)
     if decimals >= 27:
-        return value * (10 ** (decimals - 27))
+        return value * scale
     else:
-        return value // (10 ** (27 - decimals))
+        return value // scale
 
 
 def decimal_to_ray(value: int, decimals: int = 18) -> int:
@@ -197,10 +233,11 @@ def decimal_to_ray(value: int, decimals: int = 18) -> int:
         >>> decimal_to_ray(1000000000000000000, 18)  # 1.0 in 18 decimals
         1000000000000000000000000000
     """
+    scale = _DECIMAL_SCALE.get(decimals) or 10 ** abs(decimals - 27)
     if decimals >= 27:
-        return value // (10 ** (decimals - 27))
+        return value // scale
     else:
-        return value * (10 ** (27 - decimals))
+        return value * scale
 
 
 def percentage_to_ray(percentage: float) -> int:
@@ -217,7 +254,9 @@ def percentage_to_ray(percentage: float) -> int:
         >>> percentage_to_ray(5.5)  # 5.5%
         55000000000000000000000000
     """
-    return int(percentage * RAY / 100)
+    # Parse the decimal literal exactly; percentage * RAY in floats keeps
+    # only 53 bits and corrupts the low RAY digits
+    return Fraction(str(percentage)) * RAY // 100
 
 
 def ray_to_percentage(value: int) -> float:
@@ -0,0 +1,59 @@
+"""
+Shared fixtures for backend tests.
+"""
+
+import time
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.models import Base, ReserveState
+from src.utils.ray_math import RAY
+
+BTC = "btc_asset_id_placeholder"
+USDT = "usdt_asset_id_placeholder"
+
+
+@pytest.fixture
+async def session_factory() -> AsyncGenerator[async_sessionmaker, None]:
+    """In-memory SQLite database with both simulated reserves created."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        for asset_id in (BTC, USDT):
+            session.add(ReserveState(
+                asset_id=asset_id,
+                utxo_id=f"utxo_{asset_id}",
+                total_liquidity=0,
+                total_borrowed=0,
+                liquidity_index=RAY,
+                variable_borrow_index=RAY,
+                current_liquidity_rate=0,
+                current_variable_borrow_rate=0,
+                last_update_timestamp=int(time.time()),
+                reserve_factor=RAY // 10,
+            ))
+        await session.commit()
+    
+    yield factory
+    
+    # Let post-commit broadcasts finish before the engine goes away
+    from src.services.reserve_service import drain_background_tasks
+    await drain_background_tasks()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(session_factory: async_sessionmaker) -> AsyncGenerator[AsyncSession, None]:
+    """Session on the test database."""
+    async with session_factory() as session:
+        yield session
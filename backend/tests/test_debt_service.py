@@ -0,0 +1,149 @@
+"""
+DebtService liquidation: liquidatable scan, collateral seizure and the
+post-liquidation health factor.
+"""
+
+import pytest
+from sqlalchemy import select
+
+from src.models import DebtPosition, ReserveState, User
+from src.services.debt_service import DebtService
+from src.utils.ray_math import RAY
+
+BTC = "btc_asset_id_placeholder"
+USDT = "usdt_asset_id_placeholder"
+BORROWER = "lq1qqborrower0000"
+LIQUIDATOR = "lq1qqliquidator00"
+
+ONE_BTC = 100_000_000
+USDT_UNIT = 100_000_000
+
+
+async def _open_positions(session_factory, *debts_usdt: int) -> list[int]:
+    """Open one position per debt (whole USDT), each backed by 1 BTC at $60,000."""
+    async with session_factory() as session:
+        user = User(address=BORROWER)
+        session.add(user)
+        await session.flush()
+
+        positions = [
+            DebtPosition(
+                user_id=user.id,
+                borrowed_asset_id=USDT,
+                collateral_asset_id=BTC,
+                principal=debt * USDT_UNIT,
+                borrow_index_at_open=RAY,
+                collateral_amount=ONE_BTC,
+            )
+            for debt in debts_usdt
+        ]
+        session.add_all(positions)
+
+        reserve = await session.scalar(
+            select(ReserveState).where(ReserveState.asset_id == USDT)
+        )
+        reserve.total_borrowed = sum(debts_usdt) * USDT_UNIT
+        await session.commit()
+        return [position.id for position in positions]
+
+
+async def _liquidatable_ids(session_factory, price_overrides=None) -> set[int]:
+    async with session_factory() as session:
+        positions = await DebtService(session).get_liquidatable_positions(price_overrides)
+
+    for position in positions:
+        assert position["health_factor"] < RAY
+    return {position["position_id"] for position in positions}
+
+
+async def test_liquidatable_scan_matches_health_factor(session_factory):
+    # 1 BTC at $60,000 weighs $48,000 at the 80% threshold
+    ids = await _open_positions(session_factory, 40_000, 47_999, 48_000, 48_001, 50_000)
+
+    async with session_factory() as session:
+        service = DebtService(session)
+        expected = set()
+        for position_id in ids:
+            position = await session.get(DebtPosition, position_id)
+            if await service.get_position_health_factor(position) < RAY:
+                expected.add(position_id)
+
+    assert expected == set(ids[3:])
+    assert await _liquidatable_ids(session_factory) == expected
+
+
+async def test_liquidatable_scan_uses_price_overrides(session_factory):
+    ids = await _open_positions(session_factory, 40_000, 47_999, 48_000, 48_001, 50_000)
+
+    # At $50,000 the weighted collateral is $40,000: exactly 1.0 is still healthy
+    assert await _liquidatable_ids(session_factory, {BTC: 50_000 * RAY}) == set(ids[1:])
+    assert await _liquidatable_ids(session_factory, {BTC: 70_000 * RAY}) == set()
+
+
+async def test_full_liquidation_seizes_all_collateral(session_factory):
+    (position_id,) = await _open_positions(session_factory, 50_000)
+
+    async with session_factory() as session:
+        result = await DebtService(session).liquidate(LIQUIDATOR, position_id)
+
+    # Debt plus the 5% bonus is worth more than the collateral: capped at all of it
+    assert result["repaid_amount"] == 50_000 * USDT_UNIT
+    assert result["collateral_seized"] == ONE_BTC
+    assert result["health_factor_after"] == 0
+
+    async with session_factory() as session:
+        assert await session.get(DebtPosition, position_id) is None
+        reserve = await session.scalar(
+            select(ReserveState).where(ReserveState.asset_id == USDT)
+        )
+        assert reserve.total_borrowed == 0
+        assert reserve.total_liquidity == 50_000 * USDT_UNIT
+        assert await DebtService(session).calculate_health_factor(BORROWER) is None
+
+
+async def test_partial_liquidation_seizes_repaid_share_plus_bonus(session_factory):
+    (position_id,) = await _open_positions(session_factory, 50_000)
+
+    async with session_factory() as session:
+        result = await DebtService(session).liquidate(
+            LIQUIDATOR, position_id, repay_amount=10_000 * USDT_UNIT
+        )
+
+    # A fifth of the debt repaid seizes a fifth of the collateral, plus 5%
+    assert result["collateral_seized"] == ONE_BTC * 21 // 100
+
+    async with session_factory() as session:
+        position = await session.get(DebtPosition, position_id)
+        assert position.principal == 40_000 * USDT_UNIT
+        assert position.collateral_amount == ONE_BTC * 79 // 100
+
+
+async def test_health_factor_after_liquidation_matches_recompute(session_factory):
+    # The liquidated position plus a second one that stays untouched
+    liquidated_id, _ = await _open_positions(session_factory, 50_000, 30_000)
+
+    async with session_factory() as session:
+        result = await DebtService(session).liquidate(
+            LIQUIDATOR, liquidated_id, repay_amount=12_345 * USDT_UNIT
+        )
+
+    async with session_factory() as session:
+        user = await session.scalar(select(User).where(User.address == BORROWER))
+        recomputed = await DebtService(session).calculate_health_factor(BORROWER)
+
+    assert recomputed is not None
+    assert user.health_factor == recomputed
+    assert result["health_factor_after"] == recomputed
+
+
+async def test_healthy_position_is_not_liquidated(session_factory):
+    (position_id,) = await _open_positions(session_factory, 40_000)
+
+    async with session_factory() as session:
+        with pytest.raises(ValueError, match="healthy"):
+            await DebtService(session).liquidate(LIQUIDATOR, position_id)
+
+    async with session_factory() as session:
+        position = await session.get(DebtPosition, position_id)
+        assert position.principal == 40_000 * USDT_UNIT
+        assert position.collateral_amount == ONE_BTC
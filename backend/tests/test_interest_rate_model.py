@@ -0,0 +1,62 @@
+"""
+Interest rate model: per-second conversion and utilization curve.
+"""
+
+import pytest
+
+from src.services.interest_rate_model import InterestRateModel
+from src.utils.ray_math import RAY, SECONDS_PER_YEAR, accrue_index
+
+
+@pytest.fixture
+def model() -> InterestRateModel:
+    return InterestRateModel()
+
+
+def test_per_second_rate_is_annual_over_seconds_per_year(model):
+    annual = model.BASE_BORROW_RATE
+    per_second = model._to_per_second(annual)
+    
+    # A plain division by the second count, not ray_div (which would be RAY times too large)
+    assert per_second == annual // SECONDS_PER_YEAR
+    assert 0 <= annual - per_second * SECONDS_PER_YEAR < SECONDS_PER_YEAR
+
+
+def test_empty_reserve_has_no_rates(model):
+    assert model.calculate_rates(0, 0, RAY // 10) == (0, 0)
+
+
+def test_idle_reserve_borrow_rate_is_base_rate(model):
+    liquidity_rate, borrow_rate = model.calculate_rates(1_000_000, 0, RAY // 10)
+    assert borrow_rate == model.BASE_BORROW_RATE // SECONDS_PER_YEAR
+    assert liquidity_rate == 0
+
+
+def test_borrow_rate_at_optimal_utilization(model):
+    # 80% utilized: base + slope1
+    _, borrow_rate = model.calculate_rates(1_000_000, 800_000, RAY // 10)
+    expected = (model.BASE_BORROW_RATE + model.SLOPE1) // SECONDS_PER_YEAR
+    assert abs(borrow_rate - expected) <= 1
+
+
+def test_borrow_rate_above_optimal_uses_second_slope(model):
+    # 90% utilized: base + slope1 + slope2 * (0.1 / 0.2)
+    _, borrow_rate = model.calculate_rates(1_000_000, 900_000, RAY // 10)
+    expected = (model.BASE_BORROW_RATE + model.SLOPE1 + model.SLOPE2 // 2) // SECONDS_PER_YEAR
+    assert abs(borrow_rate - expected) <= 1
+
+
+def test_liquidity_rate_is_borrow_rate_times_utilization_net_of_fee(model):
+    # 50% utilized, 10% reserve factor
+    liquidity_rate, borrow_rate = model.calculate_rates(1_000_000, 500_000, RAY // 10)
+    expected = borrow_rate * 5 * 9 // 100
+    assert abs(liquidity_rate - expected) <= 1
+
+
+def test_one_year_at_base_rate_accrues_base_rate(model):
+    _, borrow_rate = model.calculate_rates(1_000_000, 0, RAY // 10)
+    index = accrue_index(RAY, borrow_rate, SECONDS_PER_YEAR)
+    
+    # Linear accrual over a year returns the 2% annual rate, give or take
+    # the per-second truncation
+    assert abs(index - (RAY + model.BASE_BORROW_RATE)) < SECONDS_PER_YEAR
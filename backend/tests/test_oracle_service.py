@@ -0,0 +1,130 @@
+"""
+OracleService price cache: coalescing, shared feeds, TTLs and staleness.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import pytest
+
+from src.services.oracle_service import OracleService, PriceFeed
+from src.utils.ray_math import RAY
+
+BTC = "btc_asset_id_placeholder"
+USDT = "usdt_asset_id_placeholder"
+
+
+class CountingOracle(OracleService):
+    """Oracle whose fetches are counted, slow enough to overlap, and scriptable."""
+    
+    def __init__(self):
+        super().__init__()
+        self.fetches: list[str] = []
+        self.prices = {BTC: 60000 * RAY, USDT: RAY}
+        self.age = 0  # seconds the oracle reports its feeds as already old
+    
+    async def _fetch_price(self, asset_id: str) -> Optional[PriceFeed]:
+        self.fetches.append(asset_id)
+        await asyncio.sleep(0.01)
+        if asset_id not in self.prices:
+            return None
+        return PriceFeed(asset_id, self.prices[asset_id], int(time.time()) - self.age)
+
+
+@pytest.fixture
+def oracle() -> CountingOracle:
+    return CountingOracle()
+
+
+async def test_concurrent_misses_share_one_fetch(oracle):
+    feeds = await asyncio.gather(*(oracle.get_price(BTC) for _ in range(10)))
+    
+    assert oracle.fetches == [BTC]
+    assert {feed.price for feed in feeds} == {60000 * RAY}
+    assert oracle._inflight == {}
+
+
+async def test_cancelled_caller_does_not_cancel_shared_fetch(oracle):
+    first = asyncio.ensure_future(oracle.get_price(BTC))
+    second = asyncio.ensure_future(oracle.get_price(BTC))
+    await asyncio.sleep(0)
+    first.cancel()
+    
+    feed = await second
+    assert feed is not None and feed.price == 60000 * RAY
+    assert oracle.fetches == [BTC]
+
+
+async def test_cached_price_is_served_without_fetching(oracle):
+    await oracle.get_price(BTC)
+    await oracle.get_price(BTC)
+    assert oracle.fetches == [BTC]
+
+
+async def test_get_prices_returns_only_known_assets(oracle):
+    prices = await oracle.get_prices([BTC, USDT, "unknown"])
+    assert {asset: feed.price for asset, feed in prices.items()} == {
+        BTC: 60000 * RAY,
+        USDT: RAY,
+    }
+
+
+async def test_assets_on_one_feed_share_its_cache_entry(oracle):
+    oracle.register_collection("wrapped_btc", BTC)
+    
+    btc = await oracle.get_price(BTC)
+    wrapped = await oracle.get_price("wrapped_btc")
+    
+    assert oracle.fetches == [BTC]
+    assert wrapped.asset_id == "wrapped_btc"
+    assert wrapped.price == btc.price
+
+
+async def test_ttl_grows_for_steady_feeds_and_shrinks_for_moving_ones(oracle):
+    await oracle.get_price(BTC)
+    
+    await oracle._refresh_price(BTC)
+    assert oracle._ttl[BTC] == oracle._cache_ttl * 2
+    
+    oracle.prices[BTC] += RAY
+    await oracle._refresh_price(BTC)
+    assert oracle._ttl[BTC] == oracle._cache_ttl
+    
+    for _ in range(10):
+        await oracle._refresh_price(BTC)
+    assert oracle._ttl[BTC] == oracle.MAX_CACHE_TTL
+    assert oracle.MAX_CACHE_TTL < oracle.MAX_PRICE_AGE
+
+
+async def test_stale_oracle_feed_is_rejected_only_when_max_age_is_given(oracle):
+    oracle.age = oracle.MAX_PRICE_AGE + 60
+    
+    assert await oracle.get_price(BTC, max_age=oracle.MAX_PRICE_AGE) is None
+    assert await oracle.get_asset_value(100_000_000, BTC) is None
+    assert await oracle.get_price(USDT) is not None
+
+
+def test_price_feed_staleness_uses_unix_seconds():
+    now = int(time.time())
+    assert not PriceFeed(BTC, RAY, now - 10).is_stale(300)
+    assert PriceFeed(BTC, RAY, now - 301).is_stale(300)
+
+
+async def test_price_cache_evicts_least_recently_used_feed(oracle, monkeypatch):
+    monkeypatch.setattr(oracle, "MAX_CACHED_FEEDS", 2)
+    oracle.prices["third_asset"] = 2 * RAY
+    
+    await oracle.get_price(BTC)
+    await oracle.get_price(USDT)
+    await oracle._refresh_price(USDT)  # gives USDT an adapted TTL entry
+    await oracle.get_price(BTC)  # cache hit: BTC becomes most recent
+    await oracle.get_price("third_asset")
+    
+    assert list(oracle._price_cache) == [BTC, "third_asset"]
+    assert USDT not in oracle._ttl
+    
+    # The evicted feed is fetched again on its next use
+    oracle.fetches.clear()
+    await oracle.get_price(USDT)
+    assert oracle.fetches == [USDT]
@@ -0,0 +1,44 @@
+"""
+Position scaling must match the former ray_div/ray_mul round trip.
+"""
+
+import random
+
+import pytest
+
+from src.models.debt_position import DebtPosition
+from src.models.supply_position import SupplyPosition
+from src.utils.ray_math import RAY, ray_div, ray_mul
+
+
+def _samples(count: int = 20_000):
+    rng = random.Random(1919)
+    for _ in range(count):
+        amount = rng.randrange(1, 10**15)
+        start_index = rng.randrange(RAY, 3 * RAY)
+        current_index = rng.randrange(start_index, 4 * RAY)
+        yield amount, current_index, start_index
+
+
+def test_scale_underlying_matches_old_formula():
+    for atoken, current_index, start_index in _samples():
+        old = ray_mul(atoken * RAY, ray_div(current_index, start_index)) // RAY
+        assert SupplyPosition.scale_underlying(atoken, current_index, start_index) == old
+
+
+def test_scale_debt_matches_old_formula():
+    for principal, current_index, start_index in _samples():
+        old = ray_mul(principal, ray_div(current_index, start_index))
+        assert DebtPosition.scale_debt(principal, current_index, start_index) == old
+
+
+@pytest.mark.parametrize("amount", [0, 1, 12_345, 10**15])
+def test_scaling_is_identity_without_accrual(amount):
+    index = RAY + RAY // 7
+    assert SupplyPosition.scale_underlying(amount, index, index) == amount
+    assert DebtPosition.scale_debt(amount, index, index) == amount
+
+
+def test_scale_underlying_rounds_down():
+    # 10 * 1.15 / 1.0 = 11.5 -> 11 (never credit more than was accrued)
+    assert SupplyPosition.scale_underlying(10, RAY * 115 // 100, RAY) == 11
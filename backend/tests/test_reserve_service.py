@@ -0,0 +1,136 @@
+"""
+ReserveService withdraw: FIFO aToken burn across supply positions.
+"""
+
+import pytest
+from sqlalchemy import event, select, update
+
+from src.models import ReserveState, SupplyPosition
+from src.services.coordinator import CoordinatorService
+from src.services.reserve_service import ReserveService, drain_background_tasks
+from src.utils.ray_math import RAY
+
+USDT = "usdt_asset_id_placeholder"
+SUPPLIER = "lq1qqsupplier0000"
+
+
+async def _supply(session_factory, *amounts: int) -> None:
+    for amount in amounts:
+        async with session_factory() as session:
+            await ReserveService(session).supply(SUPPLIER, USDT, amount)
+
+
+async def _balances(session_factory) -> list[int]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(SupplyPosition.atoken_amount).order_by(SupplyPosition.id)
+        )
+        return list(result.scalars())
+
+
+async def _withdraw(session_factory, amount: int) -> tuple[int, int, int]:
+    async with session_factory() as session:
+        return await ReserveService(session).withdraw(SUPPLIER, USDT, amount)
+
+
+async def test_withdraw_burns_oldest_positions_first(session_factory):
+    await _supply(session_factory, 5000, 7000, 9000)
+    
+    withdrawn, burned, _ = await _withdraw(session_factory, 8000)
+    
+    assert (withdrawn, burned) == (8000, 8000)
+    assert await _balances(session_factory) == [0, 4000, 9000]
+
+
+async def test_withdraw_plan_is_at_most_two_updates(session_factory):
+    await _supply(session_factory, 3000, 3000, 3000, 9000)
+    
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+    
+    def record(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE supply_positions"):
+            statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await _withdraw(session_factory, 10_000)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    
+    # Three emptied positions in one statement, the partial one in another
+    assert len(statements) == 2
+    assert await _balances(session_factory) == [0, 0, 0, 8000]
+
+
+async def test_withdraw_exactly_one_position_leaves_no_partial(session_factory):
+    await _supply(session_factory, 5000, 7000)
+    
+    await _withdraw(session_factory, 5000)
+    
+    assert await _balances(session_factory) == [0, 7000]
+
+
+async def test_withdraw_all_includes_accrued_interest(session_factory):
+    await _supply(session_factory, 5000, 7000)
+    async with session_factory() as session:
+        await session.execute(
+            update(ReserveState)
+            .where(ReserveState.asset_id == USDT)
+            # 10% interest on the 12,000 supplied, paid into the reserve
+            .values(liquidity_index=RAY * 11 // 10, total_liquidity=13_200)
+        )
+        await session.commit()
+    
+    withdrawn, burned, index = await _withdraw(session_factory, 0)
+    
+    assert index == RAY * 11 // 10
+    assert withdrawn == 13_200
+    assert burned == 12_000
+    assert await _balances(session_factory) == [0, 0]
+    
+    async with session_factory() as session:
+        reserve = (await session.execute(
+            select(ReserveState).where(ReserveState.asset_id == USDT)
+        )).scalar_one()
+    assert reserve.total_liquidity == 0
+
+
+async def test_withdraw_more_than_balance_changes_nothing(session_factory):
+    await _supply(session_factory, 5000)
+    
+    with pytest.raises(ValueError, match="Insufficient balance"):
+        await _withdraw(session_factory, 5001)
+    
+    assert await _balances(session_factory) == [5000]
+
+
+async def test_withdraw_errors_tell_unknown_user_from_empty_asset(session_factory):
+    await _supply(session_factory, 5000)
+    
+    async with session_factory() as session:
+        service = ReserveService(session)
+        with pytest.raises(ValueError, match="User not found"):
+            await service.withdraw("lq1qqnobody00000", USDT, 1)
+        with pytest.raises(ValueError, match="No supply positions"):
+            await service.withdraw(SUPPLIER, "btc_asset_id_placeholder", 1)
+
+
+async def test_withdraw_broadcast_uses_its_own_session(session_factory, monkeypatch):
+    await _supply(session_factory, 5000)
+    broadcast_sessions = []
+    
+    async def assemble(self, **kwargs):
+        # Must still be usable after the request session has closed
+        await self.session.execute(select(SupplyPosition.id))
+        broadcast_sessions.append(self.session)
+        return "txid"
+    
+    monkeypatch.setattr(CoordinatorService, "assemble_withdraw_transaction", assemble)
+    
+    async with session_factory() as session:
+        await ReserveService(session).withdraw(SUPPLIER, USDT, 1000)
+    await drain_background_tasks()
+    
+    assert len(broadcast_sessions) == 1
+    assert broadcast_sessions[0] is not session
@@ -0,0 +1,131 @@
+"""
+UTXOLock: token-guarded acquire/release, in-process and on Redis.
+"""
+
+import asyncio
+import os
+
+import pytest
+import redis.asyncio as aioredis
+
+from src.services.coordinator import UTXOLock
+
+
+class FakeRedis:
+    """Just enough of redis.asyncio for UTXOLock: SET NX PX and the release script."""
+    
+    def __init__(self):
+        self.store: dict[str, str] = {}
+    
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+    
+    async def eval(self, script, numkeys, key, token):
+        # Same semantics as UTXOLock._RELEASE_SCRIPT: compare, then delete
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+@pytest.fixture(autouse=True)
+def local_locks(monkeypatch):
+    """Isolate the class-level lock state and default to the in-process backend."""
+    monkeypatch.setattr(UTXOLock, "_redis", None)
+    monkeypatch.setattr(UTXOLock, "_local_locks", {})
+    monkeypatch.setattr(UTXOLock, "_local_expiries", [])
+    monkeypatch.setattr("src.services.coordinator.settings.REDIS_URL", "")
+
+
+@pytest.fixture
+def fake_redis(monkeypatch) -> FakeRedis:
+    client = FakeRedis()
+    monkeypatch.setattr(UTXOLock, "_redis", client)
+    return client
+
+
+async def test_lock_is_exclusive_until_released():
+    token = await UTXOLock.acquire("reserve_a")
+    assert token is not None
+    assert await UTXOLock.acquire("reserve_a") is None
+    
+    await UTXOLock.release("reserve_a", token)
+    assert await UTXOLock.acquire("reserve_a") is not None
+
+
+async def test_release_with_wrong_token_keeps_lock():
+    token = await UTXOLock.acquire("reserve_a")
+    await UTXOLock.release("reserve_a", "not-the-token")
+    assert await UTXOLock.acquire("reserve_a") is None
+    
+    await UTXOLock.release("reserve_a", token)
+    assert await UTXOLock.acquire("reserve_a") is not None
+
+
+async def test_expired_lease_is_reclaimed_and_old_holder_cannot_release(monkeypatch):
+    monkeypatch.setattr(UTXOLock, "LOCK_TTL_MS", 1)
+    stale_token = await UTXOLock.acquire("reserve_a")
+    await asyncio.sleep(0.01)
+    
+    monkeypatch.setattr(UTXOLock, "LOCK_TTL_MS", 30_000)
+    new_token = await UTXOLock.acquire("reserve_a")
+    assert new_token is not None
+    
+    # The expired holder's release must not free the new holder's lock
+    await UTXOLock.release("reserve_a", stale_token)
+    assert await UTXOLock.acquire("reserve_a") is None
+
+
+async def test_acquire_many_is_all_or_nothing():
+    busy = await UTXOLock.acquire("reserve_b")
+    
+    assert await UTXOLock.acquire_many("reserve_a", "reserve_b") is None
+    # The lock taken on reserve_a was handed back
+    assert await UTXOLock.acquire("reserve_a") is not None
+    
+    await UTXOLock.release("reserve_b", busy)
+
+
+async def test_acquire_many_locks_duplicates_once_and_releases_all():
+    held = await UTXOLock.acquire_many("reserve_a", "reserve_b", "reserve_a")
+    assert held is not None and set(held) == {"reserve_a", "reserve_b"}
+    
+    await UTXOLock.release_many(held)
+    assert await UTXOLock.acquire_many("reserve_a", "reserve_b") is not None
+
+
+async def test_redis_lock_uses_prefixed_key_and_compare_and_delete(fake_redis):
+    token = await UTXOLock.acquire("reserve_a")
+    assert fake_redis.store == {UTXOLock.KEY_PREFIX + "reserve_a": token}
+    assert await UTXOLock.acquire("reserve_a") is None
+    
+    await UTXOLock.release("reserve_a", "not-the-token")
+    assert UTXOLock.KEY_PREFIX + "reserve_a" in fake_redis.store
+    
+    await UTXOLock.release("reserve_a", token)
+    assert fake_redis.store == {}
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_REDIS_URL"),
+    reason="set TEST_REDIS_URL to run against a real Redis",
+)
+async def test_release_script_on_real_redis(monkeypatch):
+    client = aioredis.from_url(os.environ["TEST_REDIS_URL"])
+    monkeypatch.setattr(UTXOLock, "_redis", client)
+    try:
+        token = await UTXOLock.acquire("test_reserve")
+        assert token is not None
+        assert await UTXOLock.acquire("test_reserve") is None
+        
+        await UTXOLock.release("test_reserve", "not-the-token")
+        assert await client.get(UTXOLock.KEY_PREFIX + "test_reserve") == token.encode()
+        
+        await UTXOLock.release("test_reserve", token)
+        assert await client.get(UTXOLock.KEY_PREFIX + "test_reserve") is None
+    finally:
+        await client.delete(UTXOLock.KEY_PREFIX + "test_reserve")
+        await client.aclose()